@@ -1,5 +1,8 @@
 """Application configuration loaded from environment variables."""
 
+from functools import lru_cache
+from typing import Literal
+
 from pydantic_settings import BaseSettings
 from pydantic import Field
 
@@ -19,12 +22,33 @@ class Settings(BaseSettings):
     allow_leading_zero_equiv: bool = Field(
         default=True, description="Allow leading-zero equivalence in PO matching"
     )
+    pipeline_concurrency: int = Field(
+        default=4, ge=1, description="Max documents run through a pipeline concurrently"
+    )
+    text_extraction_workers: int = Field(
+        default=0, ge=0, description="Processes for PDF text extraction (0 = one per CPU, 1 = serial)"
+    )
+    pdf_text_backend: Literal["pypdf", "pypdfium2"] = Field(
+        default="pypdf", description="PDF text extractor (pypdfium2 is much faster if installed)"
+    )
+    ocr_backend: Literal["pytesseract", "tesserocr"] = Field(
+        default="pytesseract", description="OCR engine for scanned PDFs"
+    )
+    ocr_omp_thread_limit: int = Field(
+        default=1, ge=0, description="OMP_THREAD_LIMIT set for tesseract at startup (0 = leave unset)"
+    )
 
     # Storage
     storage_base_path: str = Field(default="data/", description="Base path for file storage")
 
     # Redis
     redis_url: str = Field(default="redis://localhost:6379/0", description="Redis connection URL")
+    fallback_workers: int = Field(
+        default=2, ge=1, description="In-process job threads when Redis/RQ is unavailable"
+    )
+    llm_cache_ttl_days: int = Field(
+        default=30, ge=0, description="Days to keep LLM responses cached in Redis (0 = disabled)"
+    )
 
     # API
     api_host: str = Field(default="0.0.0.0", description="API host")
@@ -33,5 +57,14 @@ class Settings(BaseSettings):
     model_config = {"env_file": ".env", "env_file_encoding": "utf-8", "case_sensitive": False}
 
 
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the process-wide Settings (the .env file is parsed once).
+
+    Usable as a FastAPI dependency: ``Depends(get_settings)``.
+    """
+    return Settings()
+
+
 # Singleton instance
-settings = Settings()
+settings = get_settings()
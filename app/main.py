@@ -4,15 +4,18 @@ from __future__ import annotations
 
 import logging
 import sys
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 import structlog
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, Response
 from fastapi.staticfiles import StaticFiles
 
 from app.config import settings
+from app.routers.process import shutdown_executor
+from app.services.text_extraction import apply_ocr_thread_limit, shutdown_extraction_pool
 
 # Frontend directory
 FRONTEND_DIR = Path(__file__).resolve().parent.parent / "frontend"
@@ -23,8 +26,9 @@ FRONTEND_DIR = Path(__file__).resolve().parent.parent / "frontend"
 
 structlog.configure(
     processors=[
-        structlog.contextvars.merge_contextvars,
+        # Drop below-level events before any other processor runs
         structlog.stdlib.filter_by_level,
+        structlog.contextvars.merge_contextvars,
         structlog.stdlib.add_logger_name,
         structlog.stdlib.add_log_level,
         structlog.stdlib.PositionalArgumentsFormatter(),
@@ -45,10 +49,20 @@ logging.basicConfig(
     level=logging.INFO,
 )
 
+# Before any OCR runs here (in-process fallback jobs and /v1 extraction)
+apply_ocr_thread_limit()
+
 # ---------------------------------------------------------------------------
 # App setup
 # ---------------------------------------------------------------------------
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    shutdown_executor()
+    shutdown_extraction_pool()
+
+
 app = FastAPI(
     title="DocProcessing API",
     description=(
@@ -59,6 +73,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 # CORS — allow all in development
@@ -99,8 +114,22 @@ app.include_router(documents_router)
 # Static files (frontend)
 # ---------------------------------------------------------------------------
 
+# Browser cache lifetime for frontend assets. Filenames are not content-hashed,
+# so keep this short rather than marking the assets immutable.
+STATIC_CACHE_CONTROL = "public, max-age=3600"
+
+
+class CachedStaticFiles(StaticFiles):
+    """StaticFiles that lets browsers cache assets instead of revalidating on every load."""
+
+    def file_response(self, *args, **kwargs) -> Response:
+        response = super().file_response(*args, **kwargs)
+        response.headers.setdefault("Cache-Control", STATIC_CACHE_CONTROL)
+        return response
+
+
 if FRONTEND_DIR.exists():
-    app.mount("/static", StaticFiles(directory=str(FRONTEND_DIR)), name="static")
+    app.mount("/static", CachedStaticFiles(directory=str(FRONTEND_DIR)), name="static")
 
 
 # ---------------------------------------------------------------------------
@@ -2,10 +2,14 @@
 
 from __future__ import annotations
 
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import chain
+
 import structlog
 
 from app.config import settings
-from app.reconcile.po_normalizer import are_equivalent, normalize_po
+from app.reconcile.po_normalizer import canonicalize_po
 from app.schemas.common import (
     FinalStatus,
     MatchStatus,
@@ -16,26 +20,33 @@ from app.schemas.common import (
 logger = structlog.get_logger(__name__)
 
 
+@dataclass(slots=True, frozen=True)
 class ReconcileResult:
-    """Outcome of reconciling two pipeline results."""
-
-    def __init__(
-        self,
-        match_status: MatchStatus,
-        decided_po_primary: str | None,
-        decided_po_secondary: str | None,
-        decided_po_numbers: list[str],
-        status: FinalStatus,
-        next_action: NextAction,
-        reject_reason: str | None = None,
-    ):
-        self.match_status = match_status
-        self.decided_po_primary = decided_po_primary
-        self.decided_po_secondary = decided_po_secondary
-        self.decided_po_numbers = decided_po_numbers
-        self.status = status
-        self.next_action = next_action
-        self.reject_reason = reject_reason
+    """Outcome of reconciling two pipeline results.
+
+    Results are memoized and shared between calls with identical inputs, so
+    treat them (including ``decided_po_numbers``) as read-only.
+    """
+
+    match_status: MatchStatus
+    decided_po_primary: str | None
+    decided_po_secondary: str | None
+    decided_po_numbers: list[str]
+    status: FinalStatus
+    next_action: NextAction
+    reject_reason: str | None = None
+
+
+def _merge_po_numbers(result_a: PipelineResult, result_b: PipelineResult) -> list[str]:
+    """Ordered union of both pipelines' po_numbers (A first, first occurrence wins)."""
+    a_numbers = result_a.po_numbers
+    b_numbers = result_b.po_numbers
+    # Common cases: one side (or both) has nothing to merge in
+    if not b_numbers:
+        return list(dict.fromkeys(a_numbers)) if len(a_numbers) > 1 else list(a_numbers)
+    if not a_numbers:
+        return list(dict.fromkeys(b_numbers)) if len(b_numbers) > 1 else list(b_numbers)
+    return list(dict.fromkeys(chain(a_numbers, b_numbers)))
 
 
 def reconcile(
@@ -51,34 +62,95 @@ def reconcile(
     - MISMATCH if both have valid POs but they don't match.
     - NEEDS_REVIEW if one is empty and the other has values, both empty,
       or confidence is below threshold.
+
+    The outcome depends only on each side's POs and confidence, so it is
+    memoized on those fields; repeated (A, B) pairs skip the comparison.
     """
     if min_confidence is None:
         min_confidence = settings.min_confidence
     if allow_leading_zero is None:
         allow_leading_zero = settings.allow_leading_zero_equiv
 
-    a_primary = normalize_po(result_a.po_primary)
-    a_secondary = normalize_po(result_a.po_secondary)
-    b_primary = normalize_po(result_b.po_primary)
-    b_secondary = normalize_po(result_b.po_secondary)
+    return _reconcile_cached(
+        _cache_key(result_a), _cache_key(result_b), min_confidence, allow_leading_zero
+    )
+
+
+# (po_primary, po_secondary, po_numbers, confidence) — every field reconcile reads
+_CacheKey = tuple[str | None, str | None, tuple[str, ...], float]
+
 
-    a_set = {v for v in [a_primary, a_secondary] if v}
-    b_set = {v for v in [b_primary, b_secondary] if v}
+def _cache_key(result: PipelineResult) -> _CacheKey:
+    return (result.po_primary, result.po_secondary, tuple(result.po_numbers), result.confidence)
 
-    # Build full PO sets from po_numbers lists (richer comparison)
-    a_all_normalized = [normalize_po(p) for p in result_a.po_numbers if normalize_po(p)]
-    b_all_normalized = [normalize_po(p) for p in result_b.po_numbers if normalize_po(p)]
-    if a_all_normalized:
-        a_set = set(a_all_normalized)
-    if b_all_normalized:
-        b_set = set(b_all_normalized)
+
+def _from_cache_key(key: _CacheKey) -> PipelineResult:
+    po_primary, po_secondary, po_numbers, confidence = key
+    return PipelineResult.model_construct(
+        po_primary=po_primary,
+        po_secondary=po_secondary,
+        po_numbers=list(po_numbers),
+        confidence=confidence,
+    )
+
+
+@lru_cache(maxsize=16384)
+def _reconcile_cached(
+    key_a: _CacheKey,
+    key_b: _CacheKey,
+    min_confidence: float,
+    allow_leading_zero: bool,
+) -> ReconcileResult:
+    return _reconcile(
+        _from_cache_key(key_a), _from_cache_key(key_b), min_confidence, allow_leading_zero
+    )
+
+
+def _reconcile(
+    result_a: PipelineResult,
+    result_b: PipelineResult,
+    min_confidence: float,
+    allow_leading_zero: bool,
+) -> ReconcileResult:
+    """Uncached reconciliation logic (see reconcile())."""
+    # Fast path: both pipelines returned the same single PO character for
+    # character (no secondary, no po_numbers list) — the common agreement case.
+    # Produces exactly what the full comparison below would.
+    if (
+        result_a.po_primary
+        and result_a.po_primary == result_b.po_primary
+        and not result_a.po_secondary
+        and not result_b.po_secondary
+        and not result_a.po_numbers
+        and not result_b.po_numbers
+        and result_a.normalized_po_primary
+        and (result_a.confidence >= min_confidence or result_b.confidence >= min_confidence)
+    ):
+        return ReconcileResult(
+            match_status=MatchStatus.MATCH_OK,
+            decided_po_primary=result_a.po_primary,
+            decided_po_secondary=None,
+            decided_po_numbers=[result_a.po_primary],
+            status=FinalStatus.OK,
+            next_action=NextAction.AUTO_OK,
+        )
+
+    # Normalized forms are computed once per PipelineResult and cached on it
+    a_primary = result_a.normalized_po_primary
+    a_secondary = result_a.normalized_po_secondary
+    b_primary = result_b.normalized_po_primary
+    b_secondary = result_b.normalized_po_secondary
+
+    # Prefer the full po_numbers lists (richer comparison)
+    a_set = result_a.normalized_po_numbers or {v for v in [a_primary, a_secondary] if v}
+    b_set = result_b.normalized_po_numbers or {v for v in [b_primary, b_secondary] if v}
 
     # Check confidence threshold
     low_confidence = (
         result_a.confidence < min_confidence and result_b.confidence < min_confidence
     )
 
-    logger.info(
+    logger.debug(
         "reconcile_start",
         a_primary=a_primary,
         a_secondary=a_secondary,
@@ -103,8 +175,6 @@ def reconcile(
     # Case 2: one empty, other has values
     if (a_set and not b_set) or (b_set and not a_set):
         source = result_a if a_set else result_b
-        decided_primary = normalize_po(source.po_primary)
-        decided_secondary = normalize_po(source.po_secondary)
         source_po_numbers = source.po_numbers if source.po_numbers else [
             p for p in [source.po_primary, source.po_secondary] if p
         ]
@@ -132,28 +202,23 @@ def reconcile(
             )
 
     # Case 3: both have values — check for match
-    # Normalize both full sets for comparison
-    a_norm_set = {normalize_po(p) for p in a_set}
-    b_norm_set = {normalize_po(p) for p in b_set}
+    # a_set / b_set already hold normalized values
+    a_norm_set = a_set
+    b_norm_set = b_set
 
-    # Also check with leading-zero equivalence
+    # Canonical keys (leading zeros stripped when allowed) turn equivalence
+    # into plain equality, so set operations replace pairwise comparison.
+    a_canon = {canonicalize_po(p, allow_leading_zero) for p in a_norm_set}
+    b_canon = {canonicalize_po(p, allow_leading_zero) for p in b_norm_set}
+
+    # Also check with leading-zero equivalence: every item in A has an
+    # equivalent in B and vice versa
     sets_equal = a_norm_set == b_norm_set
     if not sets_equal and allow_leading_zero:
-        # Try pairwise equivalence: every item in A has an equivalent in B and vice versa
-        def _all_matched(src: set, tgt: set) -> bool:
-            for s in src:
-                if not any(are_equivalent(s, t, True) for t in tgt):
-                    return False
-            return True
-        sets_equal = _all_matched(a_norm_set, b_norm_set) and _all_matched(b_norm_set, a_norm_set)
+        sets_equal = a_canon == b_canon
 
     # Check set intersection (for partial overlap)
-    set_intersects = False
-    for a_val in a_set:
-        for b_val in b_set:
-            if are_equivalent(a_val, b_val, allow_leading_zero):
-                set_intersects = True
-                break
+    set_intersects = bool(a_canon & b_canon)
 
     if sets_equal:
         # FULL MATCH — both pipelines agree 100% on all PO numbers
@@ -162,9 +227,7 @@ def reconcile(
                 match_status=MatchStatus.NEEDS_REVIEW,
                 decided_po_primary=result_a.po_primary,
                 decided_po_secondary=result_a.po_secondary or result_b.po_secondary,
-                decided_po_numbers=list(dict.fromkeys(
-                    result_a.po_numbers + result_b.po_numbers
-                )),
+                decided_po_numbers=_merge_po_numbers(result_a, result_b),
                 status=FinalStatus.NOT_OK,
                 next_action=NextAction.SEND_TO_REVIEW,
                 reject_reason="POs match but both have low confidence",
@@ -172,18 +235,24 @@ def reconcile(
 
         # Pick the decided POs (prefer A's primary since it matched)
         all_pos: list[str] = []
-        for po in [result_a.po_primary, result_b.po_primary,
-                    result_a.po_secondary, result_b.po_secondary]:
-            if po and normalize_po(po) not in {normalize_po(p) for p in all_pos}:
+        seen: set[str | None] = set()
+        for po, norm in [
+            (result_a.po_primary, a_primary),
+            (result_b.po_primary, b_primary),
+            (result_a.po_secondary, a_secondary),
+            (result_b.po_secondary, b_secondary),
+        ]:
+            if not po:
+                continue
+            if norm not in seen:
+                seen.add(norm)
                 all_pos.append(po)
 
         decided_primary = all_pos[0] if all_pos else None
         decided_secondary = all_pos[1] if len(all_pos) > 1 else None
 
         # Build full decided_po_numbers from both pipelines
-        decided_po_numbers = list(dict.fromkeys(
-            result_a.po_numbers + result_b.po_numbers
-        ))
+        decided_po_numbers = _merge_po_numbers(result_a, result_b)
         if not decided_po_numbers:
             decided_po_numbers = all_pos
 
@@ -200,9 +269,7 @@ def reconcile(
         # PARTIAL MATCH — some POs overlap but sets are not identical
         decided_primary = result_a.po_primary or result_b.po_primary
         decided_secondary = result_a.po_secondary or result_b.po_secondary
-        decided_po_numbers = list(dict.fromkeys(
-            result_a.po_numbers + result_b.po_numbers
-        ))
+        decided_po_numbers = _merge_po_numbers(result_a, result_b)
         if not decided_po_numbers:
             decided_po_numbers = [p for p in [decided_primary, decided_secondary] if p]
 
@@ -227,3 +294,30 @@ def reconcile(
             next_action=NextAction.SEND_TO_REVIEW,
             reject_reason=f"Pipeline A={result_a.po_primary}, Pipeline B={result_b.po_primary}: no match",
         )
+
+
+def reconcile_batch(
+    results_a: list[PipelineResult],
+    results_b: list[PipelineResult],
+    min_confidence: float | None = None,
+    allow_leading_zero: bool | None = None,
+) -> list[ReconcileResult]:
+    """Reconcile many (A, B) pairs, resolving settings defaults only once.
+
+    Equivalent to calling reconcile() on each pair in order.
+    """
+    if len(results_a) != len(results_b):
+        raise ValueError(
+            f"results_a and results_b differ in length ({len(results_a)} != {len(results_b)})"
+        )
+    if min_confidence is None:
+        min_confidence = settings.min_confidence
+    if allow_leading_zero is None:
+        allow_leading_zero = settings.allow_leading_zero_equiv
+
+    outcomes = [
+        reconcile(a, b, min_confidence=min_confidence, allow_leading_zero=allow_leading_zero)
+        for a, b in zip(results_a, results_b)
+    ]
+    logger.info("reconcile_cache", **_reconcile_cached.cache_info()._asdict())
+    return outcomes
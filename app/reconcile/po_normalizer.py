@@ -2,9 +2,27 @@
 
 from __future__ import annotations
 
-import re
+from functools import lru_cache
 
 
+class _KeepDigitsTable(dict):
+    """str.translate table that keeps ASCII digits and deletes everything else.
+
+    Non-digit code points are added (mapped to None) the first time they are
+    seen, so later lookups stay inside the C dict.
+    """
+
+    def __missing__(self, key: int) -> None:
+        self[key] = None
+        return None
+
+
+_KEEP_DIGITS = _KeepDigitsTable({c: c for c in range(ord("0"), ord("9") + 1)})
+
+
+# The same raw PO strings recur across pipelines and documents in a batch,
+# so both pure helpers below are memoized.
+@lru_cache(maxsize=4096)
 def normalize_po(raw: str | None) -> str | None:
     """Normalize a PO: remove spaces and non-digit characters.
 
@@ -12,10 +30,14 @@ def normalize_po(raw: str | None) -> str | None:
     """
     if not raw:
         return None
-    cleaned = re.sub(r"[^0-9]", "", raw.strip())
+    # Fast path: most POs arrive already clean (ASCII digits only)
+    if raw.isascii() and raw.isdigit():
+        return raw
+    cleaned = raw.translate(_KEEP_DIGITS)
     return cleaned if cleaned else None
 
 
+@lru_cache(maxsize=4096)
 def canonicalize_po(normalized: str | None, allow_leading_zero: bool = True) -> str | None:
     """Canonicalize a PO for equivalence comparison.
 
@@ -25,10 +47,11 @@ def canonicalize_po(normalized: str | None, allow_leading_zero: bool = True) ->
     """
     if not normalized:
         return None
-    if allow_leading_zero:
-        stripped = normalized.lstrip("0")
-        return stripped if stripped else "0"
-    return normalized
+    # Nothing to strip — the usual case
+    if not allow_leading_zero or normalized[0] != "0":
+        return normalized
+    stripped = normalized.lstrip("0")
+    return stripped if stripped else "0"
 
 
 def are_equivalent(
@@ -6,12 +6,13 @@ from typing import Optional
 
 import structlog
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
+from app.config import settings
 from app.schemas.common import NextAction
-from app.services.excel_export import generate_index_excel
-from app.schemas.common import DocumentRecord
 from app.storage import local as storage
+from app.storage.job_store import create_job
+from app.workers.tasks import regenerate_index_excel
 
 logger = structlog.get_logger(__name__)
 
@@ -26,74 +27,72 @@ class DocumentUpdateResponse(BaseModel):
     doc_index: int
     decided_po_primary: Optional[str]
     next_action: str
-    excel_regenerated: bool
+    excel_regenerated: bool = Field(
+        ..., description="True if index.xlsx was already updated when responding"
+    )
+    excel_job_id: Optional[str] = Field(
+        None,
+        description=(
+            "Job tracking the Excel update: poll GET /v1/jobs/{excel_job_id} "
+            "until COMPLETED before downloading index.xlsx"
+        ),
+    )
 
 
 @router.patch("/{source_file_id}/{doc_index}", response_model=DocumentUpdateResponse)
-async def update_document(source_file_id: str, doc_index: int, req: DocumentUpdateRequest):
+def update_document(
+    source_file_id: str,
+    doc_index: int,
+    req: DocumentUpdateRequest,
+):
     """Update a document's decided PO and set next_action to REVISTO.
 
-    Also regenerates the Excel export with the updated data.
+    The Excel export is refreshed by an RQ job tracked as ``excel_job_id``;
+    without Redis it is updated inline before responding.
     """
-    # Load the reconcile artifact
-    reconcile_data = storage.load_artifact(source_file_id, "reconcile")
-    if reconcile_data is None:
+    # Update just this document's row
+    patch = {"next_action": NextAction.REVISTO.value}
+    if req.decided_po_primary is not None:
+        patch["decided_po_primary"] = req.decided_po_primary
+    try:
+        doc = storage.update_reconcile_doc(source_file_id, doc_index, patch)
+    except FileNotFoundError:
         raise HTTPException(status_code=404, detail="Reconcile artifact not found.")
-
-    if doc_index < 0 or doc_index >= len(reconcile_data):
+    if doc is None:
         raise HTTPException(status_code=404, detail=f"Document index {doc_index} out of range.")
 
-    # Update the document
-    doc = reconcile_data[doc_index]
-    if req.decided_po_primary is not None:
-        doc["decided_po_primary"] = req.decided_po_primary
-    doc["next_action"] = NextAction.REVISTO.value
-
-    # Save updated artifact
-    storage.save_artifact(source_file_id, "reconcile", reconcile_data)
-
-    # Regenerate Excel export
+    # Refresh the Excel export in the background; inline if RQ is unavailable
     excel_regenerated = False
+    # Tracked in Redis only: job.json stays the batch's processing job
+    excel_job_id = create_job(source_file_id, persist_file=False)
     try:
-        excel_docs = []
-        for i, d in enumerate(reconcile_data):
-            result_a = d.get("result_a") or {}
-            result_b = d.get("result_b") or {}
-            doc_range = d.get("range") or {}
-
-            excel_docs.append(DocumentRecord(
-                source_file_id=source_file_id,
-                doc_id=f"{source_file_id}_doc{str(i + 1).zfill(3)}",
-                page_start=doc_range.get("start_page", 0),
-                page_end=doc_range.get("end_page", 0),
-                supplier_a=result_a.get("supplier"),
-                po_primary_a=result_a.get("po_primary"),
-                po_secondary_a=result_a.get("po_secondary"),
-                po_numbers_a=result_a.get("po_numbers", []),
-                confidence_a=result_a.get("confidence", 0),
-                method_a=result_a.get("method"),
-                supplier_b=result_b.get("supplier"),
-                po_primary_b=result_b.get("po_primary"),
-                po_secondary_b=result_b.get("po_secondary"),
-                po_numbers_b=result_b.get("po_numbers", []),
-                confidence_b=result_b.get("confidence", 0),
-                method_b=result_b.get("method"),
-                match_status=d.get("match_status"),
-                decided_po_primary=d.get("decided_po_primary"),
-                decided_po_secondary=d.get("decided_po_secondary"),
-                decided_po_numbers=d.get("decided_po_numbers", []),
-                status=d.get("status"),
-                next_action=d.get("next_action"),
-                reject_reason=d.get("reject_reason"),
-            ))
-
-        generate_index_excel(
-            source_file_id=source_file_id,
-            documents=excel_docs,
+        from redis import Redis
+        from rq import Queue
+
+        q = Queue(connection=Redis.from_url(settings.redis_url))
+        # enqueue_call, not enqueue: enqueue() would take job_id as the RQ
+        # job's own id and the task would run without its tracking job
+        q.enqueue_call(
+            "app.workers.tasks.regenerate_index_excel",
+            kwargs={
+                "source_file_id": source_file_id,
+                "doc_index": doc_index,
+                "job_id": excel_job_id,
+            },
+            timeout="5m",
+        )
+        logger.info("excel_regen_enqueued", job_id=excel_job_id)
+    except Exception as exc:
+        logger.warning(
+            "rq_unavailable",
+            error=str(exc),
+            msg="Regenerating Excel synchronously (dev mode)",
         )
-        excel_regenerated = True
-    except Exception as e:
-        logger.error("excel_regen_failed", error=str(e))
+        try:
+            regenerate_index_excel(source_file_id, doc_index=doc_index, job_id=excel_job_id)
+            excel_regenerated = True
+        except Exception as e:
+            logger.error("excel_regen_failed", error=str(e))
 
     logger.info(
         "document_updated",
@@ -108,4 +107,5 @@ async def update_document(source_file_id: str, doc_index: int, req: DocumentUpda
         decided_po_primary=doc.get("decided_po_primary"),
         next_action=doc.get("next_action"),
         excel_regenerated=excel_regenerated,
+        excel_job_id=excel_job_id,
     )
@@ -27,7 +27,7 @@ class ExcelExportResponse(BaseModel):
 
 
 @router.post("/excel", response_model=ExcelExportResponse)
-async def export_excel(req: ExcelExportRequest):
+def export_excel(req: ExcelExportRequest):
     """Generate an index.xlsx file with full document indexation.
 
     Includes all columns: source_file_id, doc_id, page ranges,
@@ -51,11 +51,15 @@ async def download_excel(source_file_id: str):
     from app.storage import local as storage
 
     excel_path = storage.get_excel_path(source_file_id)
-    if not excel_path.exists():
+    try:
+        # One stat, reused by FileResponse instead of stat-ing again
+        stat_result = excel_path.stat()
+    except FileNotFoundError:
         raise HTTPException(status_code=404, detail="Excel file not found. Run export first.")
 
     return FileResponse(
         path=str(excel_path),
+        stat_result=stat_result,
         filename=f"index_{source_file_id}.xlsx",
         media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
     )
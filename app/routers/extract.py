@@ -2,12 +2,15 @@
 
 from __future__ import annotations
 
+import asyncio
 from typing import Literal
 
 import structlog
 from fastapi import APIRouter, HTTPException, Query
+from starlette.concurrency import run_in_threadpool
 
-from app.schemas.common import PageText, PipelineResult
+from app.config import settings
+from app.schemas.common import PageRange, PageText
 from app.schemas.extraction import (
     BoundaryRequest,
     BoundaryResponse,
@@ -20,7 +23,7 @@ from app.schemas.extraction import (
 from app.services.boundary_detection import detect_boundaries
 from app.services.pipeline_a import run_pipeline_a
 from app.services.pipeline_b import run_pipeline_b
-from app.services.text_extraction import extract_text_by_page
+from app.services.text_extraction import load_or_extract_text
 from app.storage import local as storage
 
 logger = structlog.get_logger(__name__)
@@ -28,30 +31,27 @@ logger = structlog.get_logger(__name__)
 router = APIRouter(prefix="/v1/extract", tags=["extraction"])
 
 
+def _load_or_extract_pages(source_file_id: str) -> list[PageText]:
+    """Return per-page text (cached artifact if fresh); 404 if the upload is gone."""
+    try:
+        storage.get_upload_path(source_file_id)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Source file not found")
+    return load_or_extract_text(source_file_id)
+
+
 # ---------------------------------------------------------------------------
 # POST /v1/extract/text
 # ---------------------------------------------------------------------------
 
 @router.post("/text", response_model=TextExtractionResponse)
-async def extract_text(req: TextExtractionRequest):
+def extract_text(req: TextExtractionRequest):
     """Extract text from each page of the uploaded PDF.
 
     Uses pypdf text extraction. If a page has no text (scanned/image),
     the text field will be empty — callers can use LLM fallback.
     """
-    try:
-        pdf_path = storage.get_upload_path(req.source_file_id)
-    except FileNotFoundError:
-        raise HTTPException(status_code=404, detail="Source file not found")
-
-    pages = extract_text_by_page(str(pdf_path))
-
-    # Save artifact
-    storage.save_artifact(
-        req.source_file_id,
-        "text_extraction",
-        [p.model_dump() for p in pages],
-    )
+    pages = _load_or_extract_pages(req.source_file_id)
 
     return TextExtractionResponse(
         source_file_id=req.source_file_id,
@@ -65,18 +65,13 @@ async def extract_text(req: TextExtractionRequest):
 # ---------------------------------------------------------------------------
 
 @router.post("/boundaries", response_model=BoundaryResponse)
-async def extract_boundaries(req: BoundaryRequest):
+def extract_boundaries(req: BoundaryRequest):
     """Detect document boundaries (page ranges) within a batch PDF.
 
     Uses heuristic first-page patterns (Página 1, Page 1, etc.).
     Falls back to treating the entire PDF as one document if no patterns found.
     """
-    try:
-        pdf_path = storage.get_upload_path(req.source_file_id)
-    except FileNotFoundError:
-        raise HTTPException(status_code=404, detail="Source file not found")
-
-    pages = extract_text_by_page(str(pdf_path))
+    pages = _load_or_extract_pages(req.source_file_id)
     ranges = detect_boundaries(pages)
 
     # Save artifact
@@ -107,27 +102,26 @@ async def extract_po(
     - Pipeline A: LLM-first (flexible, robust)
     - Pipeline B: Regex-first + LLM fallback (conservative)
     """
-    try:
-        pdf_path = storage.get_upload_path(req.source_file_id)
-    except FileNotFoundError:
-        raise HTTPException(status_code=404, detail="Source file not found")
-
-    all_pages = extract_text_by_page(str(pdf_path))
-    results: list[PODocResult] = []
-
-    for page_range in req.ranges:
-        # Get pages for this document range
+    all_pages = await run_in_threadpool(_load_or_extract_pages, req.source_file_id)
+    pages_by_num = {p.page: p for p in all_pages}
+    last_page = max(pages_by_num, default=-1)
+    run_pipeline = run_pipeline_a if pipeline == "A" else run_pipeline_b
+    semaphore = asyncio.Semaphore(settings.pipeline_concurrency)
+
+    async def _run(page_range: PageRange) -> PODocResult:
+        # Get pages for this document range (O(range size), not O(all pages))
         doc_pages = [
-            p for p in all_pages
-            if page_range.start_page <= p.page <= page_range.end_page
+            pages_by_num[n]
+            for n in range(page_range.start_page, min(page_range.end_page, last_page) + 1)
+            if n in pages_by_num
         ]
+        # Pipelines block on LLM calls; bound how many run at once
+        async with semaphore:
+            result = await run_in_threadpool(run_pipeline, doc_pages)
+        return PODocResult(range=page_range, result=result)
 
-        if pipeline == "A":
-            result = run_pipeline_a(doc_pages)
-        else:
-            result = run_pipeline_b(doc_pages)
-
-        results.append(PODocResult(range=page_range, result=result))
+    # gather() keeps results in request order
+    results: list[PODocResult] = await asyncio.gather(*(_run(r) for r in req.ranges))
 
     # Save artifact
     artifact_name = f"extract_{pipeline}"
@@ -6,6 +6,7 @@ import uuid
 
 import structlog
 from fastapi import APIRouter, HTTPException, UploadFile, File
+from starlette.concurrency import run_in_threadpool
 
 from app.schemas.files import FileUploadResponse
 from app.services.text_extraction import get_page_count
@@ -15,6 +16,12 @@ logger = structlog.get_logger(__name__)
 
 router = APIRouter(prefix="/v1", tags=["files"])
 
+# Uploads are streamed to disk in chunks of this size
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+# PDF header; readers accept it anywhere in the first 1024 bytes
+PDF_MAGIC = b"%PDF-"
+
 
 @router.post("/files", response_model=FileUploadResponse)
 async def upload_file(file: UploadFile = File(...)):
@@ -25,19 +32,28 @@ async def upload_file(file: UploadFile = File(...)):
     if not file.filename or not file.filename.lower().endswith(".pdf"):
         raise HTTPException(status_code=400, detail="Only PDF files are accepted")
 
-    content = await file.read()
-    if not content:
-        raise HTTPException(status_code=400, detail="Empty file")
-
     source_file_id = str(uuid.uuid4())
 
-    # Save to filesystem
-    saved_path = storage.save_upload(source_file_id, content)
+    # Stream to disk; reject non-PDF content on the first chunk
+    saved_path = storage.upload_path(source_file_id)
+    size_bytes = 0
+    try:
+        with open(saved_path, "wb") as out:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                if size_bytes == 0 and PDF_MAGIC not in chunk[:1024]:
+                    raise HTTPException(status_code=400, detail="Invalid PDF: missing %PDF- header")
+                await run_in_threadpool(out.write, chunk)
+                size_bytes += len(chunk)
+        if size_bytes == 0:
+            raise HTTPException(status_code=400, detail="Empty file")
+    except BaseException:
+        saved_path.unlink(missing_ok=True)
+        raise
     storage.ensure_output_dirs(source_file_id)
 
     # Get page count
     try:
-        page_count = get_page_count(str(saved_path))
+        page_count = await run_in_threadpool(get_page_count, str(saved_path))
     except Exception as exc:
         logger.error("pdf_read_error", error=str(exc))
         raise HTTPException(status_code=400, detail=f"Invalid PDF: {exc}")
@@ -46,7 +62,7 @@ async def upload_file(file: UploadFile = File(...)):
         "file_uploaded",
         source_file_id=source_file_id,
         filename=file.filename,
-        size_bytes=len(content),
+        size_bytes=size_bytes,
         page_count=page_count,
     )
 
@@ -54,5 +70,5 @@ async def upload_file(file: UploadFile = File(...)):
         source_file_id=source_file_id,
         filename=file.filename,
         page_count=page_count,
-        size_bytes=len(content),
+        size_bytes=size_bytes,
     )
@@ -2,9 +2,12 @@
 
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
+
 import structlog
 from fastapi import APIRouter, HTTPException
 
+from app.config import settings
 from app.schemas.jobs import JobResponse, ProcessRequest
 from app.storage import local as storage
 from app.storage.job_store import create_job, get_job
@@ -13,6 +16,28 @@ logger = structlog.get_logger(__name__)
 
 router = APIRouter(prefix="/v1", tags=["process"])
 
+# Runs jobs in-process when Redis/RQ is unavailable (dev mode). Bounded so a
+# burst of requests queues up instead of spawning a thread per job.
+_executor: ThreadPoolExecutor | None = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=settings.fallback_workers,
+            thread_name_prefix="process_full",
+        )
+    return _executor
+
+
+def shutdown_executor() -> None:
+    """Drop queued fallback jobs and release the pool (app lifespan shutdown)."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
 
 @router.post("/process", response_model=JobResponse)
 async def process_full(req: ProcessRequest):
@@ -43,8 +68,6 @@ async def process_full(req: ProcessRequest):
         from redis import Redis
         from rq import Queue
 
-        from app.config import settings
-
         redis_conn = Redis.from_url(settings.redis_url)
         q = Queue(connection=redis_conn)
         q.enqueue(
@@ -57,25 +80,20 @@ async def process_full(req: ProcessRequest):
         logger.info("job_enqueued", job_id=job_id, queue="default")
 
     except Exception as exc:
-        # If Redis/RQ not available, run synchronously (dev mode)
+        # If Redis/RQ not available, run in-process (dev mode)
         logger.warning(
             "rq_unavailable",
             error=str(exc),
             msg="Running synchronously (dev mode)",
         )
-        import threading
         from app.workers.tasks import process_full_flow
 
-        thread = threading.Thread(
-            target=process_full_flow,
-            kwargs={
-                "job_id": job_id,
-                "source_file_id": req.source_file_id,
-                "mode": req.mode,
-            },
-            daemon=True,
+        _get_executor().submit(
+            process_full_flow,
+            job_id=job_id,
+            source_file_id=req.source_file_id,
+            mode=req.mode,
         )
-        thread.start()
 
     job = get_job(job_id)
     return JobResponse(**job)
@@ -5,7 +5,7 @@ from __future__ import annotations
 import structlog
 from fastapi import APIRouter
 
-from app.reconcile.engine import reconcile
+from app.reconcile.engine import reconcile_batch
 from app.schemas.common import FinalStatus
 from app.schemas.reconciliation import (
     ReconcileDocResult,
@@ -20,7 +20,7 @@ router = APIRouter(prefix="/v1/reconcile", tags=["reconciliation"])
 
 
 @router.post("/po", response_model=ReconcileResponse)
-async def reconcile_po(req: ReconcileRequest):
+def reconcile_po(req: ReconcileRequest):
     """Reconcile PO extraction results from Pipeline A and Pipeline B.
 
     Compares each document's A vs B results and determines:
@@ -32,8 +32,12 @@ async def reconcile_po(req: ReconcileRequest):
     total_ok = 0
     total_not_ok = 0
 
-    for doc in req.documents:
-        outcome = reconcile(doc.result_a, doc.result_b)
+    outcomes = reconcile_batch(
+        [doc.result_a for doc in req.documents],
+        [doc.result_b for doc in req.documents],
+    )
+
+    for doc, outcome in zip(req.documents, outcomes):
 
         result = ReconcileDocResult(
             range=doc.range,
@@ -54,10 +58,9 @@ async def reconcile_po(req: ReconcileRequest):
         else:
             total_not_ok += 1
 
-    # Save artifact
-    storage.save_artifact(
+    # Save results (per-document rows + JSON artifact)
+    storage.save_reconcile(
         req.source_file_id,
-        "reconcile",
         [r.model_dump() for r in results],
     )
 
@@ -2,60 +2,40 @@
 
 from __future__ import annotations
 
-import json
 import uuid
 from datetime import datetime, timezone
-from pathlib import Path
 from typing import Optional
 
 import structlog
 from fastapi import APIRouter, HTTPException, Query
 
-from app.config import settings
 from app.schemas.rejects import (
     RejectCreate,
     RejectListResponse,
     RejectRecord,
     RejectResolve,
 )
+from app.storage import reject_store
 
 logger = structlog.get_logger(__name__)
 
 router = APIRouter(prefix="/v1", tags=["rejects"])
 
-# Simple file-based reject store
-_REJECTS_DIR: Path | None = None
-
-
-def _rejects_dir() -> Path:
-    d = Path(settings.storage_base_path) / "rejects"
-    d.mkdir(parents=True, exist_ok=True)
-    return d
-
 
 def _load_rejects(source_file_id: str | None = None) -> list[RejectRecord]:
     """Load all reject records, optionally filtered by source_file_id."""
     rejects: list[RejectRecord] = []
-    d = _rejects_dir()
-    for file in d.glob("*.json"):
+    for data in reject_store.list_rejects(source_file_id):
         try:
-            data = json.loads(file.read_text(encoding="utf-8"))
-            record = RejectRecord(**data)
-            if source_file_id is None or record.source_file_id == source_file_id:
-                rejects.append(record)
+            rejects.append(RejectRecord(**data))
         except Exception as exc:
-            logger.warning("reject_load_error", file=str(file), error=str(exc))
+            logger.warning("reject_load_error", reject_id=data.get("reject_id"), error=str(exc))
     return rejects
 
 
 def _save_reject(record: RejectRecord) -> None:
-    """Persist a reject record to a JSON file."""
-    d = _rejects_dir()
-    path = d / f"{record.reject_id}.json"
-    path.write_text(
-        json.dumps(record.model_dump(), ensure_ascii=False, indent=2, default=str),
-        encoding="utf-8",
-    )
+    """Persist a reject record (appended to the reject log)."""
+    reject_store.save_reject(record.model_dump())
 
 
 # ---------------------------------------------------------------------------
@@ -99,12 +79,10 @@ async def create_reject(req: RejectCreate):
 @router.post("/rejects/resolve", response_model=RejectRecord)
 async def resolve_reject(req: RejectResolve):
     """Resolve a reject by providing the correct PO number (manual review)."""
-    d = _rejects_dir()
-    path = d / f"{req.reject_id}.json"
-    if not path.exists():
+    data = reject_store.get_reject(req.reject_id)
+    if data is None:
         raise HTTPException(status_code=404, detail="Reject not found")
 
-    data = json.loads(path.read_text(encoding="utf-8"))
     record = RejectRecord(**data)
     record.resolved = True
     record.resolved_po = req.resolved_po
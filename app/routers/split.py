@@ -2,7 +2,10 @@
 
 from __future__ import annotations
 
-from typing import Optional
+import io
+import zipfile
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
 
 import structlog
 from fastapi import APIRouter, HTTPException
@@ -36,7 +39,7 @@ class SplitResponse(BaseModel):
 
 
 @router.post("/split", response_model=SplitResponse)
-async def split_batch_pdf(req: SplitRequest):
+def split_batch_pdf(req: SplitRequest):
     """Split a batch PDF into individual document PDFs by page ranges.
 
     Each resulting PDF is saved with a unique doc_id (UUID).
@@ -78,9 +81,11 @@ async def split_batch_pdf(req: SplitRequest):
 
 @router.get("/split/{source_file_id}/download")
 async def download_split_pdfs(source_file_id: str):
-    """Download all split PDFs as a single zip archive."""
-    import io
-    import zipfile
+    """Download all split PDFs as a single zip archive.
+
+    The archive is streamed as it is built, so memory use does not grow
+    with the number or size of the documents.
+    """
     from fastapi.responses import StreamingResponse
 
     # Use the split artifact to get the correct page-range order
@@ -89,18 +94,13 @@ async def download_split_pdfs(source_file_id: str):
         raise HTTPException(status_code=404, detail="No split data found. Run split first.")
 
     docs_path = storage.docs_dir(source_file_id)
-
-    buf = io.BytesIO()
-    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as zf:
-        for i, doc_entry in enumerate(split_data, start=1):
-            pdf_file = docs_path / f"{doc_entry['doc_id']}.pdf"
-            if pdf_file.exists():
-                arcname = f"{source_file_id}_doc{i:03d}.pdf"
-                zf.write(pdf_file, arcname)
-    buf.seek(0)
+    entries = [
+        (docs_path / f"{doc_entry['doc_id']}.pdf", f"{source_file_id}_doc{i:03d}.pdf")
+        for i, doc_entry in enumerate(split_data, start=1)
+    ]
 
     return StreamingResponse(
-        buf,
+        _iter_zip(entries),
         media_type="application/zip",
         headers={
             "Content-Disposition": f"attachment; filename=split_docs_{source_file_id[:8]}.zip"
@@ -124,11 +124,67 @@ async def get_split_pdf(source_file_id: str, doc_index: int):
     doc_entry = split_data[doc_index - 1]
     pdf_path = storage.docs_dir(source_file_id) / f"{doc_entry['doc_id']}.pdf"
 
-    if not pdf_path.exists():
+    try:
+        # One stat, reused by FileResponse instead of stat-ing again
+        stat_result = pdf_path.stat()
+    except FileNotFoundError:
         raise HTTPException(status_code=404, detail=f"PDF file not found for doc {doc_index}")
 
     return FileResponse(
         path=str(pdf_path),
+        stat_result=stat_result,
         media_type="application/pdf",
         headers={"Content-Disposition": "inline"},
     )
+
+
+# ---------------------------------------------------------------------------
+# Streaming ZIP helpers
+# ---------------------------------------------------------------------------
+
+ZIP_CHUNK_SIZE = 1 << 20
+
+
+class _ZipSink(io.RawIOBase):
+    """Write-only, non-seekable buffer that ZipFile writes into and we drain."""
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b) -> int:
+        self._chunks.append(bytes(b))
+        return len(b)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _iter_zip(entries: Iterable[tuple[Path, str]]) -> Iterator[bytes]:
+    """Yield a ZIP archive of ``(path, arcname)`` entries chunk by chunk.
+
+    Missing files are skipped. The sink is not seekable, so ZipFile writes
+    sizes in data descriptors after each entry; zip64 is forced so entries
+    over 4 GiB stay valid.
+    """
+    sink = _ZipSink()
+    # PDF streams are already Flate-compressed; deflating again costs CPU
+    # for almost no size reduction, so entries are stored as-is.
+    with zipfile.ZipFile(sink, "w", zipfile.ZIP_STORED) as zf:
+        for path, arcname in entries:
+            if not path.exists():
+                continue
+            with open(path, "rb") as src, zf.open(arcname, "w", force_zip64=True) as dest:
+                while chunk := src.read(ZIP_CHUNK_SIZE):
+                    dest.write(chunk)
+                    if data := sink.drain():
+                        yield data
+            if data := sink.drain():
+                yield data
+    # Central directory
+    if data := sink.drain():
+        yield data
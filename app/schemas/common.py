@@ -3,10 +3,13 @@
 from __future__ import annotations
 
 import enum
+from functools import cached_property
 from typing import Optional
 
 from pydantic import BaseModel, Field
 
+from app.reconcile.po_normalizer import normalize_po
+
 
 # ---------------------------------------------------------------------------
 # Enums
@@ -70,6 +73,22 @@ class PipelineResult(BaseModel):
     found_keywords: list[str] = Field(default_factory=list, description="Keywords matched")
     evidence: list[Evidence] = Field(default_factory=list, description="Evidence snippets")
 
+    # Normalized views used by reconciliation. Computed on first access and
+    # cached on the instance, so read them only once the result is final
+    # (i.e. after supplier/negative-context filtering).
+
+    @cached_property
+    def normalized_po_primary(self) -> Optional[str]:
+        return normalize_po(self.po_primary)
+
+    @cached_property
+    def normalized_po_secondary(self) -> Optional[str]:
+        return normalize_po(self.po_secondary)
+
+    @cached_property
+    def normalized_po_numbers(self) -> frozenset[str]:
+        return frozenset(n for p in self.po_numbers if (n := normalize_po(p)))
+
 
 class PageText(BaseModel):
     """Text content of a single PDF page."""
@@ -22,15 +22,11 @@ FIRST_PAGE_PATTERNS: list[re.Pattern] = [
     # "Albarán Página 1XXXXXXX" — page 1 with albarán number concatenated
     re.compile(r"Albar[aá]n\s+P[aá]g(?:ina)?\s*1\d{5,}", re.IGNORECASE),
     # ---------------------------------------------------------------------------
-    # "Página 1 de N", "Pagina 1 de N", "Pág. 1 de N"
-    re.compile(r"P[aá]g(?:ina)?\.?\s*[:\-]?\s*1\s+de\s+\d+", re.IGNORECASE),
-    # "Página 1" or "Pagina 1" (standalone — NOT followed by more digits)
+    # "Página 1", "Pág. 1" (NOT followed by more digits) — also matches "Página 1 de N"
     re.compile(r"P[aá]g(?:ina)?\.?\s*[:\-]?\s*1(?:\s|$|[^0-9])", re.IGNORECASE),
-    # "Page 1 of N", "Page 1"
-    re.compile(r"Page\s+1\s+of\s+\d+", re.IGNORECASE),
+    # "Page 1", "Page 1 of N"
     re.compile(r"Page\s*[:\-]?\s*1(?:\s|$|[^0-9])", re.IGNORECASE),
-    # "Seite 1 von N", "Seite 1"
-    re.compile(r"Seite\s+1\s+von\s+\d+", re.IGNORECASE),
+    # "Seite 1", "Seite 1 von N"
     re.compile(r"Seite\s*[:\-]?\s*1(?:\s|$|[^0-9])", re.IGNORECASE),
     # "1 / N" or "1/N" at end of line (common pagination)
     re.compile(r"(?:^|\s)1\s*/\s*\d+(?:\s|$)", re.MULTILINE),
@@ -56,9 +52,16 @@ CONTINUATION_PAGE_PATTERNS: list[re.Pattern] = [
     re.compile(r"Page\s+[2-9]\d*\s+of\s+\d+", re.IGNORECASE),
 ]
 
+# Every continuation pattern contains "Pág"/"Pag"/"Page", so a page whose
+# lowercased text has neither literal cannot match — most pages skip the regexes.
+_CONTINUATION_HINTS = ("pag", "pág")
+
 
 def _is_continuation_page(text: str) -> bool:
     """Check if a page is a continuation (page 2+) — should NOT be treated as first page."""
+    lowered = text.lower()
+    if not any(hint in lowered for hint in _CONTINUATION_HINTS):
+        return False
     for pattern in CONTINUATION_PAGE_PATTERNS:
         if pattern.search(text):
             return True
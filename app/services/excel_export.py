@@ -5,7 +5,8 @@ from __future__ import annotations
 from pathlib import Path
 
 import structlog
-from openpyxl import Workbook
+from openpyxl import Workbook, load_workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Alignment, Font
 from openpyxl.utils import get_column_letter
 
@@ -41,6 +42,36 @@ COLUMNS = [
     ("reject_reason", "reject_reason", 40),
 ]
 
+FIELDS = tuple(field for _header, field, _width in COLUMNS)
+
+# Column letters and header styles are the same for every export
+_COLUMN_LETTERS = tuple(get_column_letter(i) for i in range(1, len(COLUMNS) + 1))
+_HEADER_FONT = Font(bold=True, size=11)
+_HEADER_ALIGNMENT = Alignment(horizontal="center", vertical="center")
+
+
+def _enum_value(value):
+    """MatchStatus/FinalStatus/NextAction -> their string value."""
+    return getattr(value, "value", value)
+
+
+def _join_list(value):
+    """List of POs -> comma-separated string for Excel."""
+    return ", ".join(str(v) for v in value) if value else ""
+
+
+# Per-field cell converters; fields not listed are written as-is
+_CONVERTERS = {
+    "po_numbers_a": _join_list,
+    "po_numbers_b": _join_list,
+    "decided_po_numbers": _join_list,
+    "match_status": _enum_value,
+    "status": _enum_value,
+    "next_action": _enum_value,
+}
+
+_ROW_SPEC = tuple((field, _CONVERTERS.get(field)) for field in FIELDS)
+
 
 def generate_index_excel(
     source_file_id: str,
@@ -55,33 +86,27 @@ def generate_index_excel(
     Returns:
         Path to the generated Excel file.
     """
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Document Index"
+    # Write-only mode streams rows to the file instead of building a cell graph
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Document Index")
+
+    # Column widths and frozen header must be set before the first append
+    for letter, (_header, _field, width) in zip(_COLUMN_LETTERS, COLUMNS):
+        ws.column_dimensions[letter].width = width
+    ws.freeze_panes = "A2"
 
     # --- Header row ---
-    header_font = Font(bold=True, size=11)
-    for col_idx, (header, _field, width) in enumerate(COLUMNS, start=1):
-        cell = ws.cell(row=1, column=col_idx, value=header)
-        cell.font = header_font
-        cell.alignment = Alignment(horizontal="center", vertical="center")
-        ws.column_dimensions[get_column_letter(col_idx)].width = width
+    header_cells = []
+    for header, _field, _width in COLUMNS:
+        cell = WriteOnlyCell(ws, value=header)
+        cell.font = _HEADER_FONT
+        cell.alignment = _HEADER_ALIGNMENT
+        header_cells.append(cell)
+    ws.append(header_cells)
 
     # --- Data rows ---
-    for row_idx, doc in enumerate(documents, start=2):
-        doc_dict = doc.model_dump() if hasattr(doc, "model_dump") else doc.__dict__
-        for col_idx, (_header, field, _width) in enumerate(COLUMNS, start=1):
-            value = doc_dict.get(field)
-            # Convert enums to their string value
-            if hasattr(value, "value"):
-                value = value.value
-            # Convert lists to comma-separated strings for Excel
-            if isinstance(value, list):
-                value = ", ".join(str(v) for v in value) if value else ""
-            ws.cell(row=row_idx, column=col_idx, value=value)
-
-    # --- Freeze first row ---
-    ws.freeze_panes = "A2"
+    for doc in documents:
+        ws.append(_row_values(doc))
 
     # --- Save ---
     excel_path = storage.get_excel_path(source_file_id)
@@ -94,3 +119,55 @@ def generate_index_excel(
         path=str(excel_path),
     )
     return excel_path
+
+
+def update_index_excel_row(
+    source_file_id: str,
+    doc_index: int,
+    document: DocumentRecord,
+) -> Path | None:
+    """Rewrite a single data row of an existing index.xlsx in place.
+
+    Args:
+        source_file_id: UUID of the source file.
+        doc_index: 0-based document index (data row ``doc_index + 2``).
+        document: Updated DocumentRecord for that row.
+
+    Returns:
+        Path to the Excel file, or None if there is no existing workbook
+        with that row (the caller should then regenerate it in full).
+    """
+    excel_path = storage.get_excel_path(source_file_id)
+    if not excel_path.exists():
+        return None
+
+    wb = load_workbook(str(excel_path))
+    ws = wb.active
+    row_idx = doc_index + 2
+    if doc_index < 0 or row_idx > ws.max_row:
+        return None
+
+    for col_idx, value in enumerate(_row_values(document), start=1):
+        # Assign .value: ws.cell(..., value=None) would leave the old value in place
+        ws.cell(row=row_idx, column=col_idx).value = value
+    wb.save(str(excel_path))
+
+    logger.info(
+        "excel_row_updated",
+        source_file_id=source_file_id,
+        doc_index=doc_index,
+        path=str(excel_path),
+    )
+    return excel_path
+
+
+def _row_values(doc: DocumentRecord) -> list:
+    """Cell values for one DocumentRecord, in COLUMNS order."""
+    values = []
+    # Plain attribute reads; a full model_dump() would copy every field per row
+    for field, convert in _ROW_SPEC:
+        value = getattr(doc, field, None)
+        if convert is not None:
+            value = convert(value)
+        values.append(value)
+    return values
@@ -2,14 +2,19 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
 import time
-from typing import Any
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any
 
 import structlog
-from openai import OpenAI
 
 from app.config import settings
+from app.storage import llm_cache
+
+if TYPE_CHECKING:
+    from openai import OpenAI
 
 logger = structlog.get_logger(__name__)
 
@@ -76,8 +81,32 @@ PO_EXTRACTION_SCHEMA = {
 }
 
 
+# Folded into every cache key so a schema change invalidates old responses
+_SCHEMA_DIGEST = hashlib.blake2b(
+    json.dumps(PO_EXTRACTION_SCHEMA, sort_keys=True).encode(), digest_size=8
+).hexdigest()
+
+
+def _cache_key(model: str, system_prompt: str, user_content: str) -> str:
+    """Content hash identifying one LLM request."""
+    h = hashlib.blake2b(digest_size=16)
+    for part in (_SCHEMA_DIGEST, model, system_prompt, user_content):
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+@lru_cache(maxsize=1)
 def _get_client() -> OpenAI:
-    """Create an OpenAI client."""
+    """Return the process-wide OpenAI client.
+
+    Created once and reused so every call shares one HTTP connection pool
+    (the client is thread-safe). The SDK is imported lazily: it is the
+    heaviest import in the app and is only needed once an LLM call is
+    actually made.
+    """
+    from openai import OpenAI
+
     return OpenAI(api_key=settings.openai_api_key)
 
 
@@ -99,10 +128,20 @@ def call_openai_structured(
         model: Model to use (defaults to settings.openai_model).
         max_retries: Number of retries on failure.
 
+    Successful responses are cached in Redis by a hash of the request
+    (see ``app.storage.llm_cache``), so re-sending an identical document
+    does not call the API again.
+
     Returns:
         Parsed JSON dict matching PO_EXTRACTION_SCHEMA.
     """
     model = model or settings.openai_model
+    cache_key = _cache_key(model, system_prompt, user_content)
+    cached = llm_cache.get_response(cache_key)
+    if cached is not None:
+        logger.info("openai_cache_hit", model=model)
+        return cached
+
     client = _get_client()
 
     for attempt in range(1, max_retries + 1):
@@ -155,6 +194,7 @@ def call_openai_structured(
                 po_primary=result.get("po_primary"),
                 confidence=result.get("confidence"),
             )
+            llm_cache.save_response(cache_key, result)
             return result
 
         except Exception as exc:
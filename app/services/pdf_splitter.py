@@ -2,7 +2,6 @@
 
 from __future__ import annotations
 
-import io
 import uuid
 
 import structlog
@@ -17,6 +16,8 @@ logger = structlog.get_logger(__name__)
 class SplitDoc:
     """Represents a split document."""
 
+    __slots__ = ("doc_id", "page_range", "path")
+
     def __init__(self, doc_id: str, page_range: PageRange, path: str):
         self.doc_id = doc_id
         self.page_range = page_range
@@ -27,6 +28,7 @@ def split_pdf(
     pdf_path: str,
     ranges: list[PageRange],
     source_file_id: str,
+    doc_ids: list[str] | None = None,
 ) -> list[SplitDoc]:
     """Split a PDF into individual documents based on page ranges.
 
@@ -34,6 +36,8 @@ def split_pdf(
         pdf_path: Path to the source PDF.
         ranges: List of PageRange defining document boundaries.
         source_file_id: UUID of the source file (for output directory).
+        doc_ids: Pre-assigned doc_id per range (new UUIDs if omitted), so
+            callers can use the ids before the split has finished.
 
     Returns:
         List of SplitDoc with doc_id, range, and output path.
@@ -42,8 +46,8 @@ def split_pdf(
     total_pages = len(reader.pages)
     results: list[SplitDoc] = []
 
-    for page_range in ranges:
-        doc_id = str(uuid.uuid4())
+    for i, page_range in enumerate(ranges):
+        doc_id = doc_ids[i] if doc_ids is not None else str(uuid.uuid4())
         writer = PdfWriter()
 
         start = page_range.start_page
@@ -52,13 +56,10 @@ def split_pdf(
         for page_idx in range(start, end + 1):
             writer.add_page(reader.pages[page_idx])
 
-        # Write to bytes
-        buffer = io.BytesIO()
-        writer.write(buffer)
-        pdf_bytes = buffer.getvalue()
-
-        # Save
-        out_path = storage.save_split_pdf(source_file_id, doc_id, pdf_bytes)
+        # Write straight to the output file (no in-memory copy of the PDF)
+        out_path = storage.split_pdf_path(source_file_id, doc_id)
+        with open(out_path, "wb") as f:
+            writer.write(f)
 
         results.append(SplitDoc(
             doc_id=doc_id,
@@ -70,7 +71,7 @@ def split_pdf(
             "pdf_split",
             doc_id=doc_id,
             pages=f"{start}-{end}",
-            size_bytes=len(pdf_bytes),
+            size_bytes=out_path.stat().st_size,
         )
 
     logger.info("pdf_split_complete", total_documents=len(results))
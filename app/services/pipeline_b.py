@@ -3,17 +3,26 @@
 Strategy:
 1. Run regex-based extraction first (keywords + PO patterns).
 2. If strong match found (high confidence), skip LLM → return REGEX result.
+   If the text has no PO keyword and no PO-shaped number, skip LLM too.
 3. If weak/no match, fall back to LLM with a conservative prompt.
 """
 
 from __future__ import annotations
 
+from itertools import chain
+from typing import Iterable
+
 import structlog
 
 from app.config import settings
 from app.schemas.common import Evidence, PageText, PipelineMethod, PipelineResult
 from app.services.openai_client import call_openai_structured
-from app.services.po_extraction import extract_po_regex, filter_result_by_supplier
+from app.services.po_extraction import (
+    extract_po_regex,
+    filter_result_by_supplier,
+    find_keywords_in_text,
+    has_po_candidate,
+)
 
 logger = structlog.get_logger(__name__)
 
@@ -50,6 +59,9 @@ Return your analysis as structured JSON."""
 # Threshold: if regex confidence >= this, skip LLM
 REGEX_STRONG_THRESHOLD = 0.75
 
+# Max characters of document text sent to the LLM (roughly 60k chars ≈ 15k tokens)
+LLM_TEXT_BUDGET = 60000
+
 
 def run_pipeline_b(
     pages_text: list[PageText],
@@ -82,16 +94,18 @@ def run_pipeline_b(
         logger.info("pipeline_b_regex_strong", msg="Skipping LLM, regex result is confident")
         return filter_result_by_supplier(regex_result, pages_text)
 
+    # No PO keyword and not a single PO-shaped number: the conservative prompt
+    # cannot accept anything, so don't pay for the LLM call
+    if not regex_result.found_keywords and not any(
+        has_po_candidate(pt.text) for pt in pages_text
+    ):
+        logger.info("pipeline_b_trivial_skip", msg="No keywords or PO-shaped numbers, skipping LLM")
+        return regex_result
+
     # Step 3: fallback to LLM with conservative prompt
     logger.info("pipeline_b_llm_fallback", msg="Regex insufficient, calling LLM")
 
-    doc_parts: list[str] = []
-    for pt in pages_text:
-        doc_parts.append(f"--- PAGE {pt.page} ---\n{pt.text}")
-    full_text = "\n\n".join(doc_parts)
-
-    if len(full_text) > 60000:
-        full_text = full_text[:60000] + "\n\n[... text truncated ...]"
+    full_text = _build_llm_text(pages_text)
 
     raw = call_openai_structured(
         system_prompt=PROMPT_B,
@@ -119,9 +133,7 @@ def run_pipeline_b(
         # Regex found something, LLM didn't → use regex but lower confidence
         logger.info("pipeline_b_hybrid", msg="Using regex result (LLM found nothing)")
         # Merge po_numbers from both
-        merged_po_numbers = list(dict.fromkeys(
-            regex_result.po_numbers + llm_result.po_numbers
-        ))
+        merged_po_numbers = _ordered_unique(regex_result.po_numbers, llm_result.po_numbers)
         return filter_result_by_supplier(PipelineResult(
             po_primary=regex_result.po_primary,
             po_secondary=regex_result.po_secondary,
@@ -129,9 +141,7 @@ def run_pipeline_b(
             supplier=llm_result.supplier or regex_result.supplier,
             confidence=min(regex_result.confidence, 0.6),
             method=PipelineMethod.HYBRID,
-            found_keywords=list(
-                dict.fromkeys(regex_result.found_keywords + llm_result.found_keywords)
-            ),
+            found_keywords=_ordered_unique(regex_result.found_keywords, llm_result.found_keywords),
             evidence=regex_result.evidence + llm_result.evidence,
         ), pages_text)
 
@@ -139,14 +149,12 @@ def run_pipeline_b(
         # If both found something, prefer LLM but mark as hybrid
         if regex_result.po_primary:
             llm_result.method = PipelineMethod.HYBRID
-            llm_result.found_keywords = list(
-                dict.fromkeys(llm_result.found_keywords + regex_result.found_keywords)
+            llm_result.found_keywords = _ordered_unique(
+                llm_result.found_keywords, regex_result.found_keywords
             )
             llm_result.evidence = llm_result.evidence + regex_result.evidence
             # Merge po_numbers from both, LLM first
-            llm_result.po_numbers = list(dict.fromkeys(
-                llm_result.po_numbers + regex_result.po_numbers
-            ))
+            llm_result.po_numbers = _ordered_unique(llm_result.po_numbers, regex_result.po_numbers)
 
     logger.info(
         "pipeline_b_complete",
@@ -155,3 +163,84 @@ def run_pipeline_b(
         method=llm_result.method,
     )
     return filter_result_by_supplier(llm_result, pages_text)
+
+
+def _ordered_unique(*iterables: Iterable[str]) -> list[str]:
+    """Merge in order, dropping duplicates (first occurrence wins)."""
+    return list(dict.fromkeys(chain(*iterables)))
+
+
+def _build_llm_text(pages_text: list[PageText], budget: int = LLM_TEXT_BUDGET) -> str:
+    """Document text for the LLM, with page markers, within ``budget`` chars.
+
+    Documents that fit are sent whole. Longer ones keep the pages most likely
+    to hold the PO instead of just the first ``budget`` chars: pages with the
+    most PO keywords first, then their neighbours (the PO may sit on the next
+    page), then the rest in order. Kept pages are emitted in page order. If
+    the best page does not fit on its own, as much of it as the budget allows
+    is sent, around its first keyword.
+    """
+    blocks = [f"--- PAGE {pt.page} ---\n{pt.text}" for pt in pages_text]
+    # Measure before joining: an over-budget document is never built in full
+    if sum(map(len, blocks)) + 2 * (len(blocks) - 1) <= budget:
+        return "\n\n".join(blocks)
+
+    keywords = [find_keywords_in_text(pt.text) for pt in pages_text]
+    hits = sorted(
+        (i for i, found in enumerate(keywords) if found),
+        key=lambda i: (-len(keywords[i]), i),
+    )
+    neighbours = [j for i in hits for j in (i + 1, i - 1) if 0 <= j < len(blocks)]
+
+    kept: dict[int, str] = {}  # page index -> block as sent
+    used = 0
+
+    best = hits[0] if hits else 0
+    if len(blocks[best]) + 2 > budget:
+        first_keyword = min((pos for _, pos in keywords[best]), default=0)
+        kept[best] = _truncated_block(pages_text[best], first_keyword, budget - 2)
+        used = len(kept[best]) + 2
+
+    for i in [*hits, *neighbours, *range(len(blocks))]:
+        if i in kept:
+            continue
+        cost = len(blocks[i]) + 2  # "\n\n" separator
+        if used + cost > budget:
+            continue
+        kept[i] = blocks[i]
+        used += cost
+
+    parts: list[str] = []
+    previous = -1
+    for i in sorted(kept):
+        if i != previous + 1:
+            parts.append("[... pages omitted ...]")
+        parts.append(kept[i])
+        previous = i
+    if previous != len(blocks) - 1:
+        parts.append("[... pages omitted ...]")
+
+    logger.info(
+        "pipeline_b_text_selected",
+        pages_kept=len(kept),
+        pages_total=len(blocks),
+        chars=used,
+    )
+    return "\n\n".join(parts)
+
+
+_TRUNCATED = "[... text truncated ...]"
+
+
+def _truncated_block(page: PageText, first_keyword: int, limit: int) -> str:
+    """A page block cut to ``limit`` chars, keeping the text around ``first_keyword``."""
+    header = f"--- PAGE {page.page} ---\n"
+    room = max(0, limit - len(header) - 2 * (len(_TRUNCATED) + 2))
+    # Start at the top unless that would cut off the keyword's context
+    start = 0 if first_keyword < room // 2 else first_keyword - room // 4
+    text = page.text[start:start + room]
+    if start:
+        text = f"{_TRUNCATED}\n\n{text}"
+    if start + room < len(page.text):
+        text = f"{text}\n\n{_TRUNCATED}"
+    return header + text
@@ -14,6 +14,11 @@ from typing import Optional
 
 import structlog
 
+try:  # C Aho-Corasick automaton: one pass over the text for all keywords
+    import ahocorasick
+except ImportError:  # pragma: no cover - falls back to one str.find per keyword
+    ahocorasick = None
+
 from app.schemas.common import Evidence, PipelineMethod, PipelineResult
 from app.reconcile.po_normalizer import normalize_po
 
@@ -116,15 +121,33 @@ PO_KEYWORDS: list[str] = [
 ]
 
 
+class _StripAccentsTable(dict):
+    """str.translate table mapping each code point to its NFKD form minus combining marks.
+
+    Entries are computed the first time a code point is seen, so a page costs
+    one C-level translate instead of NFKD plus a Python loop over every char.
+    """
+
+    def __missing__(self, key: int) -> str | None:
+        nfkd = unicodedata.normalize("NFKD", chr(key))
+        value = "".join(c for c in nfkd if not unicodedata.combining(c)) or None
+        self[key] = value
+        return value
+
+
+_STRIP_ACCENTS = _StripAccentsTable()
+
+
 def _strip_accents(s: str) -> str:
     """Remove diacritics/accents for tolerant comparison."""
-    nfkd = unicodedata.normalize("NFKD", s)
-    return "".join(c for c in nfkd if not unicodedata.combining(c))
+    # NFKD never changes ASCII
+    return s if s.isascii() else s.translate(_STRIP_ACCENTS)
 
 
 def _normalize_keyword(kw: str) -> str:
     """Normalize a keyword for matching: lowercase, no accents, collapse whitespace."""
-    return re.sub(r"\s+", " ", _strip_accents(kw).lower().strip())
+    # split()/join collapses and strips whitespace without a regex pass
+    return " ".join(_strip_accents(kw).lower().split())
 
 
 # Pre-compute normalized keywords for fast lookup
@@ -136,6 +159,25 @@ _NORMALIZED_KEYWORDS: list[tuple[str, str]] = [
 _NORMALIZED_KEYWORDS.sort(key=lambda x: len(x[0]), reverse=True)
 
 
+def _build_keyword_automaton():
+    """Aho-Corasick automaton over the normalized keywords, or None if unavailable.
+
+    Each keyword maps to (rank, length), where rank is its index in
+    _NORMALIZED_KEYWORDS; duplicates keep the first (longest-first) entry.
+    """
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for rank, (norm_kw, _original) in enumerate(_NORMALIZED_KEYWORDS):
+        if norm_kw not in automaton:
+            automaton.add_word(norm_kw, (rank, len(norm_kw)))
+    automaton.make_automaton()
+    return automaton
+
+
+_KEYWORD_AUTOMATON = _build_keyword_automaton()
+
+
 # ---------------------------------------------------------------------------
 # PO REGEX PATTERNS (ordered by specificity / longest-first)
 # ---------------------------------------------------------------------------
@@ -167,6 +209,23 @@ PO_PATTERNS: list[tuple[re.Pattern, str]] = [
     (re.compile(r"(?<![A-Za-z\d])2\d{4,5}(?!\d)"), "2XXXX-2XXXXX"),
 ]
 
+# All of PO_PATTERNS as one alternation sharing the boundary checks, so a text
+# is scanned once instead of once per pattern. Group N (m.lastindex) is
+# PO_PATTERNS[N - 1]: the first pattern that matches a digit run decides its
+# rank, as in the per-pattern loop.
+_PO_BOUNDARY_START = r"(?<![A-Za-z\d])"
+_PO_BOUNDARY_END = r"(?!\d)"
+_PO_UNION = re.compile(
+    _PO_BOUNDARY_START
+    + "(?:"
+    + "|".join(
+        f"({pattern.pattern[len(_PO_BOUNDARY_START):-len(_PO_BOUNDARY_END)]})"
+        for pattern, _desc in PO_PATTERNS
+    )
+    + ")"
+    + _PO_BOUNDARY_END
+)
+
 # ---------------------------------------------------------------------------
 # NEGATIVE CONTEXT — labels that introduce NON-PO numbers (client IDs, etc.)
 # ---------------------------------------------------------------------------
@@ -180,7 +239,7 @@ NEGATIVE_CONTEXT_PATTERNS: list[re.Pattern] = [
     re.compile(r"GLN[:\s]*$", re.IGNORECASE),
     re.compile(r"N[°º]?\s*GLN[:\s]*$", re.IGNORECASE),
     re.compile(r"NIF[:\s]*$", re.IGNORECASE),
-    re.compile(r"IBAN\s", re.IGNORECASE),
+    re.compile(r"IBAN\s(?!\s*$)", re.IGNORECASE),  # label must be followed by more text
     re.compile(r"SWIFT[:\s]*$", re.IGNORECASE),
     re.compile(r"[Cc]uenta[:\s]*$", re.IGNORECASE),
     re.compile(r"[Cc][oó]digo\s+banc[aá]rio[:\s]*$", re.IGNORECASE),
@@ -189,14 +248,20 @@ NEGATIVE_CONTEXT_PATTERNS: list[re.Pattern] = [
     re.compile(r"Albar[aá]n\s+P[aá]g(?:ina)?\s*$", re.IGNORECASE),
 ]
 
+# One search per candidate instead of one per label (all labels are IGNORECASE)
+_NEGATIVE_CONTEXT_UNION = re.compile(
+    "|".join(f"(?:{pattern.pattern})" for pattern in NEGATIVE_CONTEXT_PATTERNS),
+    re.IGNORECASE,
+)
+
 
 def _is_negative_context(text: str, match_start: int, lookback: int = 40) -> bool:
-    """Check if a matched number is preceded by a non-PO label."""
-    prefix = text[max(0, match_start - lookback):match_start].rstrip()
-    for pattern in NEGATIVE_CONTEXT_PATTERNS:
-        if pattern.search(prefix):
-            return True
-    return False
+    """Check if a matched number is preceded by a non-PO label.
+
+    Searches the lookback window in place (pos/endpos) rather than slicing it
+    out; every label tolerates trailing whitespace before the end anchor.
+    """
+    return _NEGATIVE_CONTEXT_UNION.search(text, max(0, match_start - lookback), match_start) is not None
 
 
 def find_keywords_in_text(text: str) -> list[tuple[str, int]]:
@@ -205,6 +270,19 @@ def find_keywords_in_text(text: str) -> list[tuple[str, int]]:
     Returns list of (original_keyword, position_in_text).
     """
     normalized_text = _normalize_keyword(text)
+    if _KEYWORD_AUTOMATON is not None:
+        found = _find_keywords_automaton(normalized_text)
+    else:
+        found = _find_keywords_loop(normalized_text)
+    if not found:
+        return found
+
+    offsets = _original_offsets(text, normalized_text, [pos for _kw, pos in found])
+    return [(kw, offset) for (kw, _pos), offset in zip(found, offsets)]
+
+
+def _find_keywords_loop(normalized_text: str) -> list[tuple[str, int]]:
+    """Keyword scan with one str.find loop per keyword (no pyahocorasick)."""
     found: list[tuple[str, int]] = []
     seen_positions: set[int] = set()
 
@@ -214,15 +292,63 @@ def find_keywords_in_text(text: str) -> list[tuple[str, int]]:
             pos = normalized_text.find(norm_kw, start)
             if pos == -1:
                 break
-            # Avoid overlapping matches
+            # A longer keyword may already own this position
             if pos not in seen_positions:
                 found.append((original_kw, pos))
                 seen_positions.add(pos)
-            start = pos + 1
+            start = pos + len(norm_kw)
 
     return found
 
 
+def _find_keywords_automaton(normalized_text: str) -> list[tuple[str, int]]:
+    """Single-pass equivalent of the per-keyword find loop.
+
+    Like the loop, a keyword's matches do not overlap each other (the next
+    one starts after the previous one ends), each position is claimed by its
+    best-ranked (longest) keyword, and results come out in the same
+    (keyword rank, position) order.
+    """
+    best_rank: dict[int, int] = {}
+    next_free: dict[int, int] = {}  # rank -> end of that keyword's last match
+    # Matches are reported by end position; per keyword that is start order
+    for end, (rank, length) in _KEYWORD_AUTOMATON.iter(normalized_text):
+        pos = end - length + 1
+        if pos < next_free.get(rank, 0):
+            continue
+        next_free[rank] = end + 1
+        current = best_rank.get(pos)
+        if current is None or rank < current:
+            best_rank[pos] = rank
+
+    hits = sorted((rank, pos) for pos, rank in best_rank.items())
+    return [(_NORMALIZED_KEYWORDS[rank][1], pos) for rank, pos in hits]
+
+
+_NON_SPACE_RE = re.compile(r"\S+")
+
+
+def _original_offsets(text: str, normalized_text: str, positions: list[int]) -> list[int]:
+    """Map positions in ``_normalize_keyword(text)`` back to positions in ``text``.
+
+    Normalization collapses whitespace, so offsets drift further on every
+    blank run. Words map one-to-one, so a position is resolved through the
+    start of its word in the original text.
+    """
+    starts = [m.start() for m in _NON_SPACE_RE.finditer(text)]
+    if len(starts) != normalized_text.count(" ") + 1:
+        # Accent stripping added or removed whitespace (e.g. a lone "´");
+        # words no longer line up, keep the normalized positions.
+        return positions
+
+    offsets: list[int] = []
+    for pos in positions:
+        word = normalized_text.count(" ", 0, pos)
+        word_start = normalized_text.rfind(" ", 0, pos) + 1
+        offsets.append(starts[word] + pos - word_start)
+    return offsets
+
+
 def match_po_patterns(text: str) -> list[str]:
     """Find all valid PO numbers in a text string.
 
@@ -232,22 +358,30 @@ def match_po_patterns(text: str) -> list[str]:
     candidates: list[str] = []
     seen: set[str] = set()
 
-    for pattern, _desc in PO_PATTERNS:
-        for match in pattern.finditer(text):
-            value = match.group()
-            if value not in seen:
-                # Skip numbers in negative context (client IDs, GLN, etc.)
-                if _is_negative_context(text, match.start()):
-                    continue
-                seen.add(value)
-                candidates.append(value)
-                if len(candidates) >= 10:  # gather more, then trim
-                    break
+    # One scan, then visit hits in PO_PATTERNS order (by position within a pattern)
+    hits = sorted((m.lastindex, m.start(), m.group()) for m in _PO_UNION.finditer(text))
+    full_rank = None
+    for rank, start, value in hits:
+        if rank == full_rank:
+            continue
+        if value not in seen:
+            # Skip numbers in negative context (client IDs, GLN, etc.)
+            if _is_negative_context(text, start):
+                continue
+            seen.add(value)
+            candidates.append(value)
+            if len(candidates) >= 10:  # gather more, then trim
+                full_rank = rank  # rest of this pattern's hits are skipped
 
     # Deduplicate and return all candidates (up to 10)
     return candidates
 
 
+def has_po_candidate(text: str) -> bool:
+    """True if the text contains any number shaped like a PO (no context checks)."""
+    return _PO_UNION.search(text) is not None
+
+
 def extract_po_near_keywords(
     text: str,
     page_num: int,
@@ -269,8 +403,7 @@ def extract_po_near_keywords(
     for kw_original, kw_pos in keywords_found:
         kw_names.append(kw_original)
 
-        # The keyword position is in the NORMALIZED text, so we search
-        # broadly around the keyword in the ORIGINAL text.
+        # Search broadly around the keyword in the ORIGINAL text.
         # Look both BEFORE and AFTER the keyword (PO may precede keyword).
         search_start = max(0, kw_pos - context_chars)
         search_end = min(len(text), kw_pos + len(kw_original) + context_chars)
@@ -278,7 +411,7 @@ def extract_po_near_keywords(
 
         # Also look at the line(s) around the keyword
         remaining = text[max(0, kw_pos - context_chars):]
-        lines = remaining.split("\n")
+        lines = remaining.split("\n", 5)
         near_text = "\n".join(lines[:5])  # up to 5 nearby lines
 
         combined_search = context + " " + near_text
@@ -1,38 +1,133 @@
-"""PDF text extraction per page using pypdf, with OCR fallback for scanned PDFs."""
+"""PDF text extraction per page using pypdf (or PDFium), with OCR fallback for scanned PDFs."""
 
 from __future__ import annotations
 
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
 import structlog
 from pypdf import PdfReader
 
+from app.config import settings
 from app.schemas.common import PageText
+from app.storage import local as storage
 
 logger = structlog.get_logger(__name__)
 
+# Each worker re-opens the PDF, so only split when every worker gets a few pages
+_MIN_PAGES_PER_WORKER = 8
+
+_OCR_LANG = "por+spa+eng"
+_OCR_BATCH_PAGES = 8
+_OCR_MAX_WORKERS = 8
+
+_extraction_pool: ProcessPoolExecutor | None = None
+_extraction_pool_lock = threading.Lock()
+
 
 # ---------------------------------------------------------------------------
 # OCR fallback — used only when pypdf returns no text (scanned/image PDFs)
 # ---------------------------------------------------------------------------
 
+def _ocr_engine():
+    """Return ``image -> text`` for the configured OCR backend.
+
+    ``tesserocr`` calls libtesseract in-process (no fork and no image
+    re-encode per page); ``pytesseract`` shells out to the tesseract binary
+    and is the fallback when tesserocr is not installed.
+    """
+    if settings.ocr_backend == "tesserocr":
+        try:
+            from tesserocr import PSM, PyTessBaseAPI
+        except ImportError:
+            logger.warning("tesserocr_unavailable", msg="Falling back to pytesseract")
+        else:
+            local = threading.local()
+
+            def tesserocr_to_string(image) -> str:
+                # PyTessBaseAPI is not thread-safe: one engine per OCR thread
+                api = getattr(local, "api", None)
+                if api is None:
+                    api = local.api = PyTessBaseAPI(lang=_OCR_LANG, psm=PSM.AUTO)
+                api.SetImage(image)
+                return api.GetUTF8Text()
+
+            return tesserocr_to_string
+
+    import pytesseract
+
+    def pytesseract_to_string(image) -> str:
+        return pytesseract.image_to_string(image, lang=_OCR_LANG)
+
+    return pytesseract_to_string
+
+
+def apply_ocr_thread_limit() -> None:
+    """Cap tesseract's OpenMP threads; call once at process start-up.
+
+    Pages are OCR'd in parallel, and tesseract spawning one OpenMP thread
+    per core on top of that oversubscribes the CPU. Tesseract reads the
+    variable when it initializes, so it must be set before the first OCR
+    call. An ``OMP_THREAD_LIMIT`` already in the environment is kept.
+    """
+    if settings.ocr_omp_thread_limit > 0:
+        os.environ.setdefault("OMP_THREAD_LIMIT", str(settings.ocr_omp_thread_limit))
+
+
 def _ocr_extract_text_by_page(pdf_path: str, total_pages: int) -> list[PageText]:
-    """Extract text via OCR (pytesseract + pdf2image) for scanned PDFs."""
+    """Extract text via OCR (pdf2image + tesseract) for scanned PDFs.
+
+    Pages are rendered _OCR_BATCH_PAGES at a time (one pdftoppm run per batch
+    instead of per page, while bounding how many page images are held in
+    memory) and each batch is OCR'd concurrently. Both OCR backends work
+    outside the GIL (a tesseract subprocess, or libtesseract via tesserocr),
+    so threads overlap the OCR work.
+    """
     from pdf2image import convert_from_path
-    import pytesseract
 
-    pages: list[PageText] = []
-    for i in range(total_pages):
+    image_to_string = _ocr_engine()
+
+    def render(first: int, last: int) -> list:
+        """Page images for 0-based pages first..last - 1 (None where rendering failed)."""
         try:
-            images = convert_from_path(
-                pdf_path, first_page=i + 1, last_page=i + 1, dpi=150,
-            )
-            text = pytesseract.image_to_string(images[0], lang="por+spa+eng")
+            images = convert_from_path(pdf_path, first_page=first + 1, last_page=last, dpi=150)
+            if len(images) == last - first:
+                return images
         except Exception as exc:
-            logger.warning("ocr_page_failed", page=i, error=str(exc))
-            text = ""
-        pages.append(PageText(page=i, text=text))
+            logger.warning("ocr_batch_render_failed", first_page=first, error=str(exc))
+        # Retry page by page so one bad page does not blank the whole batch
+        images = []
+        for i in range(first, last):
+            try:
+                images.append(
+                    convert_from_path(pdf_path, first_page=i + 1, last_page=i + 1, dpi=150)[0]
+                )
+            except Exception as exc:
+                logger.warning("ocr_page_failed", page=i, error=str(exc))
+                images.append(None)
+        return images
+
+    def ocr(i: int, image) -> PageText:
+        text = ""
+        if image is not None:
+            try:
+                text = image_to_string(image)
+            except Exception as exc:
+                logger.warning("ocr_page_failed", page=i, error=str(exc))
         logger.debug("ocr_page_extracted", page=i, chars=len(text))
+        return PageText(page=i, text=text)
+
+    pages: list[PageText] = []
+    workers = max(1, min(_OCR_MAX_WORKERS, os.cpu_count() or 1))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for first in range(0, total_pages, _OCR_BATCH_PAGES):
+            last = min(first + _OCR_BATCH_PAGES, total_pages)
+            pages.extend(pool.map(ocr, range(first, last), render(first, last)))
 
-    logger.info("ocr_extraction_complete", total_pages=len(pages))
+    logger.info("ocr_extraction_complete", total_pages=len(pages), workers=workers)
     return pages
 
 
@@ -43,22 +138,24 @@ def _ocr_extract_text_by_page(pdf_path: str, total_pages: int) -> list[PageText]
 def extract_text_by_page(pdf_path: str) -> list[PageText]:
     """Extract text from each page of a PDF file.
 
-    Uses pypdf as the primary extraction method. If ALL pages yield no text
-    (scanned/image PDF), falls back to OCR via pytesseract + pdf2image.
+    Uses pypdf as the primary extraction method, or PDFium when
+    ``settings.pdf_text_backend`` is ``pypdfium2`` and it is installed. If ALL
+    pages yield no text (scanned/image PDF), falls back to OCR via
+    pytesseract + pdf2image.
     """
-    reader = PdfReader(pdf_path)
-    pages: list[PageText] = []
+    pages: list[PageText] | None = None
+    if settings.pdf_text_backend == "pypdfium2":
+        pages = _extract_pdfium(pdf_path)
 
-    for i, page in enumerate(reader.pages):
-        try:
-            text = page.extract_text() or ""
-        except Exception as exc:
-            logger.warning("page_text_extraction_failed", page=i, error=str(exc))
-            text = ""
-        pages.append(PageText(page=i, text=text))
-        logger.debug("page_extracted", page=i, chars=len(text))
-
-    logger.info("text_extraction_complete", total_pages=len(pages))
+    if pages is None:
+        reader = PdfReader(pdf_path)
+        total_pages = len(reader.pages)
+        workers = _extraction_workers(total_pages)
+        if workers > 1:
+            pages = _extract_parallel(pdf_path, total_pages, workers)
+        if pages is None:
+            pages = [_extract_page(page, i) for i, page in enumerate(reader.pages)]
+        logger.info("text_extraction_complete", total_pages=len(pages), workers=workers)
 
     # --- OCR fallback for scanned/image-only PDFs ---
     has_any_text = any(p.text.strip() for p in pages)
@@ -73,7 +170,168 @@ def extract_text_by_page(pdf_path: str) -> list[PageText]:
     return pages
 
 
+def load_or_extract_text(source_file_id: str) -> list[PageText]:
+    """Return per-page text for an upload, reusing the ``text_extraction`` artifact if fresh.
+
+    The artifact is only trusted if it is newer than the uploaded PDF, so a
+    re-upload under the same id is re-parsed. Otherwise the PDF is extracted
+    and the artifact (re)written. Raises FileNotFoundError if the upload is gone.
+    """
+    pdf_path = storage.get_upload_path(source_file_id)
+
+    artifact_path = storage.get_artifact_path(source_file_id, "text_extraction")
+    try:
+        if artifact_path.stat().st_mtime >= pdf_path.stat().st_mtime:
+            cached = storage.load_artifact(source_file_id, "text_extraction")
+            if cached is not None:
+                return [PageText.model_validate(p) for p in cached]
+    except FileNotFoundError:
+        pass
+    except Exception as exc:
+        logger.warning("text_artifact_unreadable", source_file_id=source_file_id, error=str(exc))
+
+    pages = extract_text_by_page(str(pdf_path))
+    storage.save_artifact(source_file_id, "text_extraction", (p.model_dump() for p in pages))
+    return pages
+
+
+def _extract_page(page, index: int) -> PageText:
+    try:
+        text = page.extract_text() or ""
+    except Exception as exc:
+        logger.warning("page_text_extraction_failed", page=index, error=str(exc))
+        text = ""
+    logger.debug("page_extracted", page=index, chars=len(text))
+    return PageText(page=index, text=text)
+
+
+def _extract_pdfium(pdf_path: str) -> list[PageText] | None:
+    """Extract every page with PDFium (C++), or None to fall back to pypdf.
+
+    Fast enough to stay serial; PDFium is not thread-safe, so pages are not
+    handed to a thread pool.
+    """
+    try:
+        import pypdfium2 as pdfium
+    except ImportError:
+        logger.warning("pypdfium2_unavailable", msg="Falling back to pypdf")
+        return None
+
+    try:
+        pdf = pdfium.PdfDocument(pdf_path)
+    except Exception as exc:
+        logger.warning("pdfium_open_failed", error=str(exc))
+        return None
+
+    pages: list[PageText] = []
+    try:
+        for i in range(len(pdf)):
+            try:
+                page = pdf[i]
+                # PDFium ends lines with \r\n; the PO/keyword passes split on \n
+                text = page.get_textpage().get_text_range().replace("\r\n", "\n")
+            except Exception as exc:
+                logger.warning("page_text_extraction_failed", page=i, error=str(exc))
+                text = ""
+            logger.debug("page_extracted", page=i, chars=len(text))
+            pages.append(PageText(page=i, text=text))
+    finally:
+        pdf.close()
+
+    logger.info("text_extraction_complete", total_pages=len(pages), backend="pypdfium2")
+    return pages
+
+
+def _extract_range(pdf_path: str, start: int, end: int) -> list[PageText]:
+    """Extract pages ``start``..``end - 1`` (runs in a worker process)."""
+    reader = PdfReader(pdf_path)
+    return [_extract_page(reader.pages[i], i) for i in range(start, end)]
+
+
+def _extraction_workers(total_pages: int) -> int:
+    configured = settings.text_extraction_workers or os.cpu_count() or 1
+    return max(1, min(configured, total_pages // _MIN_PAGES_PER_WORKER))
+
+
+def _mp_context():
+    """Process context for extraction workers.
+
+    forkserver children fork from a clean single-threaded server rather than
+    the (threaded) API or RQ worker; preloading this module in the server
+    means workers start without re-importing pypdf/pydantic.
+    """
+    context = multiprocessing.get_context("forkserver")
+    context.set_forkserver_preload([__name__])
+    return context
+
+
+def _get_extraction_pool() -> ProcessPoolExecutor:
+    """Process-wide pool for parallel pypdf extraction.
+
+    Created on first use and kept for the life of the process, so only the
+    first large PDF pays for starting the forkserver and its workers.
+    """
+    global _extraction_pool
+    with _extraction_pool_lock:
+        if _extraction_pool is None:
+            _extraction_pool = ProcessPoolExecutor(
+                max_workers=settings.text_extraction_workers or os.cpu_count() or 1,
+                mp_context=_mp_context(),
+            )
+        return _extraction_pool
+
+
+def shutdown_extraction_pool() -> None:
+    """Stop the extraction worker processes (app lifespan shutdown)."""
+    global _extraction_pool
+    with _extraction_pool_lock:
+        pool, _extraction_pool = _extraction_pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _reset_after_fork() -> None:
+    # A forked child (e.g. an RQ work horse) cannot drive the parent's pool
+    global _extraction_pool, _extraction_pool_lock
+    _extraction_pool = None
+    _extraction_pool_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def _extract_parallel(pdf_path: str, total_pages: int, workers: int) -> list[PageText] | None:
+    """Extract contiguous page ranges in the shared process pool, stitched back in page order.
+
+    pypdf extraction is pure Python, so threads would serialize on the GIL.
+    Returns None if the pool fails; the caller then extracts serially.
+    """
+    bounds = [total_pages * w // workers for w in range(workers + 1)]
+    try:
+        pool = _get_extraction_pool()
+        futures = [
+            pool.submit(_extract_range, pdf_path, start, end)
+            for start, end in zip(bounds, bounds[1:])
+        ]
+        return [page for future in futures for page in future.result()]
+    except Exception as exc:
+        logger.warning("parallel_text_extraction_failed", workers=workers, error=str(exc))
+        if isinstance(exc, BrokenProcessPool):
+            shutdown_extraction_pool()  # rebuilt on the next call
+        return None
+
+
 def get_page_count(pdf_path: str) -> int:
-    """Return the total number of pages in a PDF."""
+    """Return the total number of pages in a PDF.
+
+    Reads ``/Count`` from the root page tree instead of flattening every page
+    node; falls back to a full page walk if that entry is missing or invalid.
+    """
     reader = PdfReader(pdf_path)
+    try:
+        count = reader.trailer["/Root"]["/Pages"]["/Count"]
+        if isinstance(count, int) and count > 0:
+            return int(count)
+    except Exception as exc:
+        logger.debug("page_count_fast_path_failed", error=str(exc))
     return len(reader.pages)
@@ -1,8 +1,18 @@
-"""Job state persistence — Redis-backed with JSON fallback."""
+"""Job state persistence — Redis-backed with JSON fallback.
+
+Status/result/error changes are written through immediately, to Redis and the
+``job.json`` mirror. Progress-only updates (``progress`` / ``current_step``) are
+kept in memory and flushed to Redis only by a background thread at most every
+``_FLUSH_INTERVAL`` seconds, so a pipeline ticking progress per document does
+not pay a Redis SET + file write per tick.
+"""
 
 from __future__ import annotations
 
-import json
+import atexit
+import os
+import threading
+import time
 import uuid
 from datetime import datetime, timezone
 from pathlib import Path
@@ -12,47 +22,35 @@ import structlog
 
 from app.config import settings
 from app.schemas.common import JobStatus
+from app.storage import serialization
+from app.storage.redis_client import get_redis as _redis
 
 logger = structlog.get_logger(__name__)
 
 # In-memory store used as fallback when Redis is unavailable
 _memory_store: dict[str, dict] = {}
 
-# ---------------------------------------------------------------------------
-# Redis helpers (best-effort)
-# ---------------------------------------------------------------------------
-
-_redis_client = None
-
-
-def _get_redis():
-    global _redis_client
-    if _redis_client is not None:
-        return _redis_client
-    try:
-        import redis as redis_lib
-        _redis_client = redis_lib.from_url(settings.redis_url, decode_responses=True)
-        _redis_client.ping()
-        logger.info("redis_connected", url=settings.redis_url)
-        return _redis_client
-    except Exception:
-        logger.warning("redis_unavailable", msg="Falling back to in-memory job store")
-        _redis_client = False  # sentinel: tried and failed
-        return None
-
-
-def _redis():
-    r = _get_redis()
-    return r if r is not False else None
+_FLUSH_INTERVAL = 0.2  # seconds
 
+_lock = threading.Lock()  # guards _memory_store, _dirty and job dict mutation
+_write_lock = threading.Lock()  # orders encode + write, so a stale payload never lands last
+_dirty: set[str] = set()  # jobs with progress ticks not yet written out
+_flusher: threading.Thread | None = None
+_stop = threading.Event()  # set to end the flusher thread
 
 # ---------------------------------------------------------------------------
 # Public API
 # ---------------------------------------------------------------------------
 
-def create_job(source_file_id: str) -> str:
-    """Create a new job and return its ID."""
-    job_id = str(uuid.uuid4())
+def create_job(source_file_id: str, persist_file: bool = True) -> str:
+    """Create a new job and return its ID.
+
+    ``outputs/<source_file_id>/job.json`` mirrors the batch's processing job.
+    Auxiliary jobs on the same batch (e.g. an Excel refresh) pass
+    ``persist_file=False`` so they live in Redis / memory only and never
+    overwrite that mirror.
+    """
+    job_id = _uuid7()
     now = datetime.now(timezone.utc).isoformat()
     job = {
         "job_id": job_id,
@@ -64,11 +62,24 @@ def create_job(source_file_id: str) -> str:
         "error": None,
         "created_at": now,
         "updated_at": now,
+        "persist_file": persist_file,
     }
     _save(job_id, job, source_file_id)
     return job_id
 
 
+def _uuid7() -> str:
+    """Time-ordered UUID (RFC 9562 version 7): 48-bit ms timestamp + 74 random bits.
+
+    Job ids sort by creation time, so Redis keys and directory listings keep
+    insertion order. Same string format as ``uuid4``.
+    """
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10), "big")
+    value = value & ~(0xF << 76) | 0x7 << 76  # version
+    value = value & ~(0x3 << 62) | 0x2 << 62  # variant
+    return str(uuid.UUID(int=value))
+
+
 def update_job(
     job_id: str,
     *,
@@ -78,32 +89,45 @@ def update_job(
     result: Optional[dict[str, Any]] = None,
     error: Optional[str] = None,
 ) -> None:
-    """Update selected fields of a job."""
+    """Update selected fields of a job.
+
+    Progress-only updates are coalesced and written by the background flusher;
+    any status, result or error change is persisted before returning.
+    """
     job = get_job(job_id)
     if job is None:
         logger.error("job_not_found", job_id=job_id)
         return
-    if status is not None:
-        job["status"] = status.value
-    if progress is not None:
-        job["progress"] = progress
-    if current_step is not None:
-        job["current_step"] = current_step
-    if result is not None:
-        job["result"] = result
-    if error is not None:
-        job["error"] = error
-    job["updated_at"] = datetime.now(timezone.utc).isoformat()
-    _save(job_id, job, job["source_file_id"])
+    with _lock:
+        if status is not None:
+            job["status"] = status.value
+        if progress is not None:
+            job["progress"] = progress
+        if current_step is not None:
+            job["current_step"] = current_step
+        if result is not None:
+            job["result"] = result
+        if error is not None:
+            job["error"] = error
+        job["updated_at"] = datetime.now(timezone.utc).isoformat()
+
+    if status is None and result is None and error is None:
+        _mark_dirty(job_id, job)
+    else:
+        _save(job_id, job, job["source_file_id"])
 
 
 def get_job(job_id: str) -> Optional[dict]:
     """Retrieve a job by ID."""
+    with _lock:
+        # Unflushed local ticks are newer than what Redis holds
+        if job_id in _dirty:
+            return _memory_store[job_id]
     r = _redis()
     if r:
         raw = r.get(f"job:{job_id}")
         if raw:
-            return json.loads(raw)
+            return serialization.loads(raw)
     return _memory_store.get(job_id)
 
 
@@ -113,21 +137,96 @@ def get_job(job_id: str) -> Optional[dict]:
 
 def _save(job_id: str, job: dict, source_file_id: str) -> None:
     """Persist job to Redis + in-memory + JSON file."""
-    _memory_store[job_id] = job
+    with _write_lock:
+        with _lock:
+            _memory_store[job_id] = job
+            _dirty.discard(job_id)
+            payload = serialization.dumps(job, indent=True)  # same bytes go to Redis and job.json
+        _write(job_id, source_file_id, payload, persist_file=job.get("persist_file", True))
+
+
+def _mark_dirty(job_id: str, job: dict) -> None:
+    """Keep a progress tick in memory until the next background flush."""
+    global _flusher
+    with _lock:
+        _memory_store[job_id] = job
+        _dirty.add(job_id)
+        if _flusher is None or not _flusher.is_alive():
+            _flusher = threading.Thread(target=_flush_loop, name="job-store-flush", daemon=True)
+            _flusher.start()
+
+
+def _flush_dirty() -> None:
+    """Write every job with pending progress ticks."""
+    with _write_lock:
+        with _lock:
+            pending = [
+                (job_id, _memory_store[job_id]["source_file_id"], serialization.dumps(_memory_store[job_id], indent=True))
+                for job_id in _dirty
+            ]
+            _dirty.clear()
+        for job_id, source_file_id, payload in pending:
+            # Ticks only matter to pollers (Redis); job.json gets the next status change
+            _write(job_id, source_file_id, payload, persist_file=False)
+
+
+def _flush_loop() -> None:
+    while not _stop.wait(_FLUSH_INTERVAL):
+        try:
+            _flush_dirty()
+        except Exception as exc:
+            logger.warning("job_flush_failed", error=str(exc))
+
+
+def _stop_flusher() -> None:
+    """Stop the flusher thread, then write whatever ticks it left behind."""
+    global _flusher
+    _stop.set()
+    if _flusher is not None:
+        _flusher.join()
+        _flusher = None
+    _stop.clear()
+    _flush_dirty()
+
 
-    # Redis
+def _reset_after_fork() -> None:
+    # RQ runs each job in a forked work horse: locks held by a parent thread
+    # would never be released there, and the parent flushes its own ticks.
+    global _lock, _write_lock, _flusher
+    _lock = threading.Lock()
+    _write_lock = threading.Lock()
+    _dirty.clear()
+    _flusher = None
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+atexit.register(_stop_flusher)
+
+
+def _write(job_id: str, source_file_id: str, payload: bytes, persist_file: bool = True) -> None:
+    """Write an encoded job to Redis and job.json (call with _write_lock held)."""
+    # Redis — SET with EX sets value and TTL in one command / round-trip
     r = _redis()
     if r:
         try:
-            r.set(f"job:{job_id}", json.dumps(job, default=str), ex=86400 * 7)
+            r.set(f"job:{job_id}", payload, ex=86400 * 7)
         except Exception:
             logger.warning("redis_save_failed", job_id=job_id)
 
-    # JSON file
+    if not persist_file:
+        return
+
+    # JSON file — write a temp file and rename it over job.json, so readers
+    # never see a half-written file
+    tmp_path = None
     try:
         out_dir = Path(settings.storage_base_path) / "outputs" / source_file_id
         out_dir.mkdir(parents=True, exist_ok=True)
         job_path = out_dir / "job.json"
-        job_path.write_text(json.dumps(job, ensure_ascii=False, indent=2, default=str), encoding="utf-8")
+        tmp_path = job_path.with_name(f"job.json.{uuid.uuid4().hex}.tmp")
+        tmp_path.write_bytes(payload)
+        os.replace(tmp_path, job_path)
     except Exception:
         logger.warning("json_save_failed", job_id=job_id)
+        if tmp_path is not None:
+            tmp_path.unlink(missing_ok=True)
@@ -0,0 +1,52 @@
+"""LLM response cache — Redis-backed, best-effort.
+
+Identical (model, prompt, document text) requests return the stored JSON
+instead of calling the API again: reprocessing a file or retrying a job
+re-sends exactly the same documents. Without Redis every lookup misses.
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+import structlog
+
+from app.config import settings
+from app.storage import serialization
+from app.storage.redis_client import get_redis as _redis
+
+logger = structlog.get_logger(__name__)
+
+_KEY_PREFIX = "llm:"
+
+
+def get_response(key: str) -> Optional[dict]:
+    """Return the cached response for ``key``, or None."""
+    if settings.llm_cache_ttl_days <= 0:
+        return None
+    r = _redis()
+    if not r:
+        return None
+    try:
+        raw = r.get(_KEY_PREFIX + key)
+        return serialization.loads(raw) if raw else None
+    except Exception as exc:
+        logger.warning("llm_cache_get_failed", error=str(exc))
+        return None
+
+
+def save_response(key: str, response: dict) -> None:
+    """Cache a successful response for ``settings.llm_cache_ttl_days``."""
+    if settings.llm_cache_ttl_days <= 0:
+        return
+    r = _redis()
+    if not r:
+        return
+    try:
+        r.set(
+            _KEY_PREFIX + key,
+            serialization.dumps(response),
+            ex=settings.llm_cache_ttl_days * 86400,
+        )
+    except Exception as exc:
+        logger.warning("llm_cache_save_failed", error=str(exc))
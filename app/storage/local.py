@@ -2,11 +2,20 @@
 
 from __future__ import annotations
 
-import json
 import os
+import sqlite3
+from contextlib import closing, contextmanager
 from pathlib import Path
+from typing import BinaryIO, Iterable, Iterator
 
 from app.config import settings
+from app.storage import serialization
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
 
 
 def _base() -> Path:
@@ -41,16 +50,14 @@ def artifacts_dir(source_file_id: str) -> Path:
 # File operations
 # ---------------------------------------------------------------------------
 
-def save_upload(source_file_id: str, file_bytes: bytes) -> Path:
-    """Save an uploaded PDF to the uploads directory."""
-    path = uploads_dir() / f"{source_file_id}.pdf"
-    path.write_bytes(file_bytes)
-    return path
+def upload_path(source_file_id: str) -> Path:
+    """Return the destination path for an uploaded PDF (may not exist yet)."""
+    return uploads_dir() / f"{source_file_id}.pdf"
 
 
 def get_upload_path(source_file_id: str) -> Path:
     """Return the path to an uploaded PDF (raises if not found)."""
-    path = uploads_dir() / f"{source_file_id}.pdf"
+    path = upload_path(source_file_id)
     if not path.exists():
         raise FileNotFoundError(f"Upload not found: {source_file_id}")
     return path
@@ -62,28 +69,156 @@ def ensure_output_dirs(source_file_id: str) -> None:
     artifacts_dir(source_file_id)
 
 
-def save_artifact(source_file_id: str, name: str, data: dict | list) -> Path:
-    """Save a JSON artifact to the artifacts directory."""
-    path = artifacts_dir(source_file_id) / f"{name}.json"
-    path.write_text(json.dumps(data, ensure_ascii=False, indent=2, default=str), encoding="utf-8")
+def get_artifact_path(source_file_id: str, name: str) -> Path:
+    """Return the path for a JSON artifact (may not exist yet)."""
+    return artifacts_dir(source_file_id) / f"{name}.json"
+
+
+def save_artifact(source_file_id: str, name: str, data: dict | Iterable) -> Path:
+    """Save a JSON artifact to the artifacts directory.
+
+    Lists (or generators) are written one item at a time, so a generator is
+    never materialized and no full JSON document is built; the file has the
+    same layout as ``json.dumps(list(data), indent=2)``.
+    """
+    path = get_artifact_path(source_file_id, name)
+    with open(path, "wb") as f:
+        if isinstance(data, dict):
+            f.write(serialization.dumps(data, indent=True))
+        else:
+            _write_json_array(f, data)
     return path
 
 
+def _write_json_array(f: BinaryIO, items: Iterable) -> None:
+    opened = False
+    for item in items:
+        f.write(b",\n  " if opened else b"[\n  ")
+        # Nest the item's indent=2 layout one level (strings never hold raw newlines)
+        f.write(serialization.dumps(item, indent=True).replace(b"\n", b"\n  "))
+        opened = True
+    f.write(b"\n]" if opened else b"[]")
+
+
 def load_artifact(source_file_id: str, name: str) -> dict | list | None:
     """Load a JSON artifact; returns None if not found."""
-    path = artifacts_dir(source_file_id) / f"{name}.json"
+    path = get_artifact_path(source_file_id, name)
     if not path.exists():
         return None
-    return json.loads(path.read_text(encoding="utf-8"))
+    return serialization.loads(path.read_bytes())
 
 
-def save_split_pdf(source_file_id: str, doc_id: str, pdf_bytes: bytes) -> Path:
-    """Save a split document PDF."""
-    path = docs_dir(source_file_id) / f"{doc_id}.pdf"
-    path.write_bytes(pdf_bytes)
-    return path
+# ---------------------------------------------------------------------------
+# Reconcile results — SQLite, one row per document
+# ---------------------------------------------------------------------------
+#
+# outputs/<id>/reconcile.db is the source of truth so a single document can
+# be edited without rewriting the whole batch. The "reconcile" JSON artifact
+# is kept as a projection for back-compat: written in full by save_reconcile
+# and refreshed after edits by the Excel regeneration task.
+
+def reconcile_db_path(source_file_id: str) -> Path:
+    """Return the path of the per-batch reconcile database."""
+    return outputs_dir(source_file_id) / "reconcile.db"
+
+
+def _connect_reconcile(source_file_id: str) -> sqlite3.Connection:
+    # Rows hold JSON text (serialization.dumps(...).decode()): SQLite's JSON
+    # functions would read bytes as a BLOB, not as JSON
+    conn = sqlite3.connect(reconcile_db_path(source_file_id))
+    conn.execute("CREATE TABLE IF NOT EXISTS docs (idx INTEGER PRIMARY KEY, data TEXT NOT NULL)")
+    return conn
+
+
+def save_reconcile(source_file_id: str, docs: list[dict]) -> Path:
+    """Replace all reconcile results for a batch (and refresh the JSON artifact)."""
+    with closing(_connect_reconcile(source_file_id)) as conn, conn:
+        conn.execute("DELETE FROM docs")
+        conn.executemany(
+            "INSERT INTO docs (idx, data) VALUES (?, ?)",
+            ((i, serialization.dumps(d).decode()) for i, d in enumerate(docs)),
+        )
+    save_artifact(source_file_id, "reconcile", docs)
+    return reconcile_db_path(source_file_id)
+
+
+def load_reconcile(source_file_id: str) -> list[dict] | None:
+    """Load all reconcile results in document order; None if there are none.
+
+    Falls back to the JSON artifact for batches processed before the
+    database existed.
+    """
+    if not reconcile_db_path(source_file_id).exists():
+        return load_artifact(source_file_id, "reconcile")
+    with closing(_connect_reconcile(source_file_id)) as conn:
+        rows = conn.execute("SELECT data FROM docs ORDER BY idx").fetchall()
+    return [serialization.loads(data) for (data,) in rows]
+
+
+def update_reconcile_doc(source_file_id: str, doc_index: int, patch: dict) -> dict | None:
+    """Merge ``patch`` into one document (JSON merge-patch) and return it.
+
+    Returns None if there is no document at ``doc_index``; raises
+    FileNotFoundError if the batch has no reconcile results at all.
+    """
+    if not reconcile_db_path(source_file_id).exists():
+        legacy = load_artifact(source_file_id, "reconcile")
+        if legacy is None:
+            raise FileNotFoundError(f"Reconcile results not found: {source_file_id}")
+        save_reconcile(source_file_id, legacy)
+
+    with closing(_connect_reconcile(source_file_id)) as conn, conn:
+        row = conn.execute(
+            "UPDATE docs SET data = json_patch(data, ?) WHERE idx = ? RETURNING data",
+            (serialization.dumps(patch).decode(), doc_index),
+        ).fetchone()
+    return serialization.loads(row[0]) if row else None
+
+
+def split_pdf_path(source_file_id: str, doc_id: str) -> Path:
+    """Return the path for a split document PDF (may not exist yet)."""
+    return docs_dir(source_file_id) / f"{doc_id}.pdf"
 
 
 def get_excel_path(source_file_id: str) -> Path:
     """Return the path for the index Excel file."""
     return outputs_dir(source_file_id) / "index.xlsx"
+
+
+@contextmanager
+def excel_lock(source_file_id: str) -> Iterator[None]:
+    """Hold an exclusive lock on a batch's index.xlsx while rewriting it.
+
+    An advisory lock on a sidecar file (``flock``, or ``msvcrt.locking`` on
+    Windows), so concurrent row updates (RQ workers or inline threads) load
+    and save the workbook one at a time instead of overwriting each other's
+    edits.
+    """
+    lock_path = outputs_dir(source_file_id) / "index.xlsx.lock"
+    with open(lock_path, "a") as f:
+        _lock_file(f)
+        try:
+            yield
+        finally:
+            _unlock_file(f)
+
+
+def _lock_file(f) -> None:
+    if fcntl is not None:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        return
+    f.seek(0)
+    while True:
+        try:
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)  # retries for ~10s, then raises
+            return
+        except OSError:
+            continue
+
+
+def _unlock_file(f) -> None:
+    if fcntl is not None:
+        fcntl.flock(f, fcntl.LOCK_UN)
+        return
+    f.seek(0)
+    msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
@@ -0,0 +1,30 @@
+"""Shared lazy Redis client (best-effort).
+
+The job store and the LLM cache both treat Redis as optional: the first call
+connects, and if that fails every later call returns None without retrying.
+"""
+
+from __future__ import annotations
+
+import structlog
+
+from app.config import settings
+
+logger = structlog.get_logger(__name__)
+
+_redis_client = None
+
+
+def get_redis():
+    """Return the Redis client, or None when Redis is unavailable."""
+    global _redis_client
+    if _redis_client is None:
+        try:
+            import redis as redis_lib
+            _redis_client = redis_lib.from_url(settings.redis_url, decode_responses=True)
+            _redis_client.ping()
+            logger.info("redis_connected", url=settings.redis_url)
+        except Exception:
+            logger.warning("redis_unavailable", msg="Falling back to in-memory jobs; LLM responses not cached")
+            _redis_client = False  # sentinel: tried and failed
+    return _redis_client or None
@@ -0,0 +1,149 @@
+"""Reject record persistence — append-only JSONL log with an in-memory index.
+
+Every create/update appends one JSON line to ``<storage>/rejects/rejects.jsonl``;
+the latest line for a ``reject_id`` wins. Each process keeps an index of the
+log and, on every read, only parses the bytes appended since its last read —
+so records written by RQ workers show up in the API without rescanning.
+"""
+
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+from typing import Iterable, Optional
+
+import structlog
+
+from app.config import settings
+from app.storage import serialization
+
+logger = structlog.get_logger(__name__)
+
+LOG_NAME = "rejects.jsonl"
+
+_lock = threading.Lock()
+_log_path: Path | None = None
+_offset = 0  # bytes of the log already folded into the index
+_index: dict[str, dict] = {}  # reject_id -> latest record
+_by_source: dict[str, list[str]] = {}  # source_file_id -> reject_ids (creation order)
+
+
+def rejects_dir() -> Path:
+    d = Path(settings.storage_base_path) / "rejects"
+    d.mkdir(parents=True, exist_ok=True)
+    return d
+
+
+# ---------------------------------------------------------------------------
+# Public API
+# ---------------------------------------------------------------------------
+
+def list_rejects(source_file_id: Optional[str] = None) -> list[dict]:
+    """Return reject records (creation order), optionally filtered by source file."""
+    with _lock:
+        _refresh()
+        if source_file_id is None:
+            return list(_index.values())
+        return [_index[rid] for rid in _by_source.get(source_file_id, [])]
+
+
+def get_reject(reject_id: str) -> Optional[dict]:
+    """Return the latest version of a reject record, or None."""
+    with _lock:
+        _refresh()
+        return _index.get(reject_id)
+
+
+def save_reject(record: dict) -> None:
+    """Append a new or updated reject record."""
+    save_rejects([record])
+
+
+def save_rejects(records: Iterable[dict]) -> None:
+    """Append several reject records in a single write."""
+    lines = [serialization.dumps(r, newline=True) for r in records]
+    if not lines:
+        return
+    with _lock:
+        _refresh()
+        _append(b"".join(lines))
+
+
+# ---------------------------------------------------------------------------
+# Internals (call with _lock held)
+# ---------------------------------------------------------------------------
+
+def _append(payload: bytes) -> None:
+    # O_APPEND + one unbuffered write keeps concurrent writers line-atomic
+    with open(_current_log(), "ab", buffering=0) as f:
+        f.write(payload)
+
+
+def _current_log() -> Path:
+    """Resolve the log path, resetting the index if the storage path changed."""
+    global _log_path, _offset
+    path = rejects_dir() / LOG_NAME
+    if path != _log_path:
+        _log_path = path
+        _offset = 0
+        _index.clear()
+        _by_source.clear()
+        _migrate_legacy_files(path.parent)
+    return path
+
+
+def _refresh() -> None:
+    """Fold any lines appended to the log since the last read into the index."""
+    global _offset
+    path = _current_log()
+    try:
+        with open(path, "rb") as f:
+            f.seek(_offset)
+            chunk = f.read()
+    except FileNotFoundError:
+        return
+
+    # Only consume complete lines; a concurrent writer may be mid-append
+    end = chunk.rfind(b"\n") + 1
+    if not end:
+        return
+    _offset += end
+
+    for line in chunk[:end].splitlines():
+        if not line.strip():
+            continue
+        try:
+            _index_record(serialization.loads(line))
+        except Exception as exc:
+            logger.warning("reject_load_error", file=str(path), error=str(exc))
+
+
+def _index_record(record: dict) -> None:
+    reject_id = record["reject_id"]
+    if reject_id not in _index:
+        _by_source.setdefault(record.get("source_file_id"), []).append(reject_id)
+    _index[reject_id] = record
+
+
+def _migrate_legacy_files(d: Path) -> None:
+    """Fold per-record ``<reject_id>.json`` files (old layout) into the log."""
+    legacy = sorted(d.glob("*.json"))
+    if not legacy:
+        return
+
+    lines: list[bytes] = []
+    migrated: list[Path] = []
+    for file in legacy:
+        try:
+            lines.append(serialization.dumps(serialization.loads(file.read_bytes()), newline=True))
+            migrated.append(file)
+        except Exception as exc:
+            # Left in place so the data is not lost; retried on next start
+            logger.warning("reject_load_error", file=str(file), error=str(exc))
+
+    if lines:
+        with open(d / LOG_NAME, "ab", buffering=0) as f:
+            f.write(b"".join(lines))
+    for file in migrated:
+        file.unlink(missing_ok=True)
+    logger.info("rejects_migrated", count=len(migrated))
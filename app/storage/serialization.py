@@ -0,0 +1,35 @@
+"""JSON encoding shared by the stores — orjson when installed, stdlib otherwise.
+
+Both paths emit UTF-8 bytes, stringify unknown types with ``str`` and write
+naive datetimes as UTC.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+try:  # orjson is ~2-5x faster and handles datetimes natively
+    import orjson
+except ImportError:  # pragma: no cover - stdlib fallback
+    orjson = None
+    import json
+
+
+def dumps(obj: Any, *, indent: bool = False, newline: bool = False) -> bytes:
+    """Serialize ``obj``; ``indent`` for 2-space pretty output, ``newline`` for JSONL."""
+    if orjson is not None:
+        option = orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if newline:
+            option |= orjson.OPT_APPEND_NEWLINE
+        return orjson.dumps(obj, default=str, option=option)
+    text = json.dumps(obj, ensure_ascii=False, indent=2 if indent else None, default=str)
+    return (text + "\n" if newline else text).encode("utf-8")
+
+
+def loads(data: str | bytes) -> Any:
+    """Parse a JSON document."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -7,10 +7,12 @@ from redis import Redis
 from rq import Worker, Queue
 
 from app.config import settings
+from app.services.text_extraction import apply_ocr_thread_limit
 
 
 def main() -> None:
     """Start the RQ worker listening on the default queue."""
+    apply_ocr_thread_limit()  # inherited by every forked job
     redis_conn = Redis.from_url(settings.redis_url)
     queues = [Queue(connection=redis_conn)]
 
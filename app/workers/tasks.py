@@ -2,28 +2,66 @@
 
 from __future__ import annotations
 
+import os
+import threading
 import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
 
 import structlog
 
+from app.config import settings
 from app.reconcile.engine import reconcile
 from app.schemas.common import (
     DocumentRecord,
     FinalStatus,
     JobStatus,
+    PageRange,
     PageText,
 )
 from app.services.boundary_detection import detect_boundaries
-from app.services.excel_export import generate_index_excel
+from app.services.excel_export import generate_index_excel, update_index_excel_row
 from app.services.pdf_splitter import split_pdf
 from app.services.pipeline_a import run_pipeline_a
 from app.services.pipeline_b import run_pipeline_b
-from app.services.text_extraction import extract_text_by_page
+from app.services.text_extraction import load_or_extract_text
 from app.storage import local as storage
+from app.storage import reject_store
 from app.storage.job_store import update_job
 
 logger = structlog.get_logger(__name__)
 
+_pipeline_pool: ThreadPoolExecutor | None = None
+_pipeline_pool_lock = threading.Lock()
+
+
+def _get_pipeline_pool() -> ThreadPoolExecutor:
+    """Process-wide pool that runs Pipeline B alongside Pipeline A.
+
+    Shared by every document and job in the process instead of an executor
+    per document. Only leaf pipeline calls are submitted, so a full pool
+    delays Pipeline B but cannot deadlock. Threads start on demand.
+    """
+    global _pipeline_pool
+    with _pipeline_pool_lock:
+        if _pipeline_pool is None:
+            _pipeline_pool = ThreadPoolExecutor(
+                max_workers=settings.pipeline_concurrency * settings.fallback_workers,
+                thread_name_prefix="pipeline",
+            )
+        return _pipeline_pool
+
+
+def _reset_after_fork() -> None:
+    # RQ runs each job in a forked work horse: the parent's pool threads do
+    # not exist there, so the child builds its own pool on first use.
+    global _pipeline_pool, _pipeline_pool_lock
+    _pipeline_pool = None
+    _pipeline_pool_lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
+
 
 def process_full_flow(
     job_id: str,
@@ -53,112 +91,67 @@ def process_full_flow(
         # Step 1: Extract text
         update_job(job_id, progress=0.05, current_step="Extracting text")
         pdf_path = str(storage.get_upload_path(source_file_id))
-        pages_text = extract_text_by_page(pdf_path)
-        storage.save_artifact(source_file_id, "text_extraction", [p.model_dump() for p in pages_text])
+        # Reuses the text artifact on a retry / reprocess of the same upload
+        pages_text = load_or_extract_text(source_file_id)
         log.info("text_extracted", pages=len(pages_text))
 
         # Step 2: Detect boundaries
         update_job(job_id, progress=0.10, current_step="Detecting boundaries")
         ranges = detect_boundaries(pages_text)
-        storage.save_artifact(source_file_id, "boundaries", [r.model_dump() for r in ranges])
+        storage.save_artifact(source_file_id, "boundaries", (r.model_dump() for r in ranges))
         log.info("boundaries_detected", documents=len(ranges))
 
-        # Step 3: Split PDF
-        update_job(job_id, progress=0.15, current_step="Splitting PDF")
-        split_docs = split_pdf(pdf_path, ranges, source_file_id)
-        doc_id_mapping = {}
-        for sd in split_docs:
-            doc_id_mapping[(sd.page_range.start_page, sd.page_range.end_page)] = sd.doc_id
-        log.info("pdf_split", documents=len(split_docs))
-
-        # Step 4 & 5: Run pipelines on each document
-        all_records: list[DocumentRecord] = []
-        total_docs = len(ranges)
-        progress_per_doc = 0.60 / max(total_docs, 1)  # 60% for extraction + reconcile
-
-        for i, page_range in enumerate(ranges):
-            doc_key = (page_range.start_page, page_range.end_page)
-            doc_id = doc_id_mapping.get(doc_key, str(uuid.uuid4()))
-            doc_pages = [p for p in pages_text if page_range.start_page <= p.page <= page_range.end_page]
-
-            progress = 0.20 + (i * progress_per_doc)
+        if not ranges:
+            # Empty PDF: nothing to split, extract, export or reject
             update_job(
                 job_id,
-                progress=round(progress, 2),
-                current_step=f"Processing doc {i + 1}/{total_docs} (pages {page_range.start_page}-{page_range.end_page})",
+                status=JobStatus.COMPLETED,
+                progress=1.0,
+                current_step="Completed",
+                result={
+                    "total_documents": 0,
+                    "total_ok": 0,
+                    "total_not_ok": 0,
+                    "excel_path": None,
+                    "documents": [],
+                },
             )
+            log.info("process_completed", total_ok=0, total_not_ok=0)
+            return
 
-            # Pipeline A
-            log.info("pipeline_a_start", doc=i + 1, pages=f"{page_range.start_page}-{page_range.end_page}")
-            result_a = run_pipeline_a(doc_pages)
-
-            # Pipeline B
-            log.info("pipeline_b_start", doc=i + 1)
-            result_b = run_pipeline_b(doc_pages)
-
-            # Reconcile
-            recon = reconcile(result_a, result_b)
-
-            record = DocumentRecord(
-                source_file_id=source_file_id,
-                doc_id=doc_id,
-                page_start=page_range.start_page,
-                page_end=page_range.end_page,
-                # Pipeline A
-                supplier_a=result_a.supplier,
-                po_primary_a=result_a.po_primary,
-                po_secondary_a=result_a.po_secondary,
-                po_numbers_a=result_a.po_numbers,
-                confidence_a=result_a.confidence,
-                method_a=result_a.method.value,
-                # Pipeline B
-                supplier_b=result_b.supplier,
-                po_primary_b=result_b.po_primary,
-                po_secondary_b=result_b.po_secondary,
-                po_numbers_b=result_b.po_numbers,
-                confidence_b=result_b.confidence,
-                method_b=result_b.method.value,
-                # Reconciliation
-                match_status=recon.match_status,
-                decided_po_primary=recon.decided_po_primary,
-                decided_po_secondary=recon.decided_po_secondary,
-                decided_po_numbers=recon.decided_po_numbers,
-                status=recon.status,
-                next_action=recon.next_action,
-                reject_reason=recon.reject_reason,
-            )
-            all_records.append(record)
-
-            log.info(
-                "doc_processed",
-                doc=i + 1,
-                status=recon.status.value,
-                match=recon.match_status.value,
-                po=recon.decided_po_primary,
-            )
-
-        # Save extraction artifacts
-        storage.save_artifact(source_file_id, "extract_A", [
-            {"range": {"start_page": r.page_start, "end_page": r.page_end},
-             "po_primary": r.po_primary_a, "po_secondary": r.po_secondary_a,
-             "po_numbers": r.po_numbers_a,
-             "confidence": r.confidence_a, "method": r.method_a}
-            for r in all_records
-        ])
-        storage.save_artifact(source_file_id, "extract_B", [
-            {"range": {"start_page": r.page_start, "end_page": r.page_end},
-             "po_primary": r.po_primary_b, "po_secondary": r.po_secondary_b,
-             "po_numbers": r.po_numbers_b,
-             "confidence": r.confidence_b, "method": r.method_b}
-            for r in all_records
-        ])
-        storage.save_artifact(source_file_id, "reconcile", [
-            {"doc_id": r.doc_id, "match_status": r.match_status.value if r.match_status else None,
-             "decided_po_primary": r.decided_po_primary, "status": r.status.value if r.status else None,
-             "next_action": r.next_action.value if r.next_action else None,
-             "reject_reason": r.reject_reason}
-            for r in all_records
-        ])
+        # Step 3: Split PDF, in the background: it only writes the split files,
+        # so the pipelines can start on the documents straight away
+        update_job(job_id, progress=0.15, current_step="Splitting PDF")
+        doc_ids = [str(uuid.uuid4()) for _ in ranges]
+        with ThreadPoolExecutor(max_workers=1) as splitter:
+            split_future = splitter.submit(split_pdf, pdf_path, ranges, source_file_id, doc_ids)
+
+            # Step 4 & 5: Run pipelines on each document
+            all_records = _process_documents(job_id, source_file_id, ranges, doc_ids, pages_text)
+
+            split_docs = split_future.result()
+            log.info("pdf_split", documents=len(split_docs))
+
+        # One JSON-mode dump per record (enums already as values) feeds every
+        # artifact and the job result
+        documents = [r.model_dump(mode="json") for r in all_records]
+
+        # Save extraction artifacts (streamed: one entry is built at a time)
+        storage.save_artifact(source_file_id, "extract_A", (
+            {"range": {"start_page": d["page_start"], "end_page": d["page_end"]},
+             "po_primary": d["po_primary_a"], "po_secondary": d["po_secondary_a"],
+             "po_numbers": d["po_numbers_a"],
+             "confidence": d["confidence_a"], "method": d["method_a"]}
+            for d in documents
+        ))
+        storage.save_artifact(source_file_id, "extract_B", (
+            {"range": {"start_page": d["page_start"], "end_page": d["page_end"]},
+             "po_primary": d["po_primary_b"], "po_secondary": d["po_secondary_b"],
+             "po_numbers": d["po_numbers_b"],
+             "confidence": d["confidence_b"], "method": d["method_b"]}
+            for d in documents
+        ))
+        storage.save_reconcile(source_file_id, [_reconcile_entry(d) for d in documents])
 
         # Step 6: Generate Excel
         update_job(job_id, progress=0.85, current_step="Generating Excel")
@@ -167,23 +160,26 @@ def process_full_flow(
 
         # Step 7: Create reject records for NOT_OK cases
         update_job(job_id, progress=0.90, current_step="Creating reject records")
-        reject_count = 0
+        now = datetime.now(timezone.utc).isoformat()
+        rejects: list[dict] = []
+        total_ok = 0  # counted in the same pass
         for record in all_records:
-            if record.status == FinalStatus.NOT_OK:
-                _create_reject_record(record)
-                reject_count += 1
-        log.info("rejects_created", count=reject_count)
+            if record.status == FinalStatus.OK:
+                total_ok += 1
+            elif record.status == FinalStatus.NOT_OK:
+                rejects.append(_build_reject_record(record, now))
+        reject_store.save_rejects(rejects)  # one append to the reject log
+        log.info("rejects_created", count=len(rejects))
 
         # Done
-        total_ok = sum(1 for r in all_records if r.status == FinalStatus.OK)
-        total_not_ok = sum(1 for r in all_records if r.status == FinalStatus.NOT_OK)
+        total_not_ok = len(rejects)
 
         result = {
             "total_documents": len(all_records),
             "total_ok": total_ok,
             "total_not_ok": total_not_ok,
             "excel_path": str(excel_path),
-            "documents": [r.model_dump() for r in all_records],
+            "documents": documents,
         }
 
         update_job(
@@ -209,24 +205,186 @@ def process_full_flow(
         )
 
 
-def _create_reject_record(record: DocumentRecord) -> None:
-    """Create a reject record for a NOT_OK document (file-based)."""
-    import json
-    import uuid as uuid_mod
-    from datetime import datetime, timezone
-    from pathlib import Path
+def _process_documents(
+    job_id: str,
+    source_file_id: str,
+    ranges: list[PageRange],
+    doc_ids: list[str],
+    pages_text: list[PageText],
+) -> list[DocumentRecord]:
+    """Run the pipelines on every document, returning records in document order.
+
+    Documents are independent and the pipelines mostly wait on the LLM, so
+    several run at once (bounded like extract_po, for rate limits).
+    """
+    total_docs = len(ranges)
+    progress_per_doc = 0.60 / max(total_docs, 1)  # 60% for extraction + reconcile
+
+    # Index pages once: each document then costs O(range size), not O(all pages)
+    pages_by_num = {p.page: p for p in pages_text}
+    last_page = max(pages_by_num, default=-1)
+    doc_inputs = []
+    for doc_id, page_range in zip(doc_ids, ranges):
+        doc_pages = [
+            pages_by_num[n]
+            for n in range(page_range.start_page, min(page_range.end_page, last_page) + 1)
+            if n in pages_by_num
+        ]
+        doc_inputs.append((doc_id, page_range, doc_pages))
+
+    update_job(job_id, progress=0.20, current_step=f"Processing {total_docs} documents")
+
+    # Stored by index so the output keeps document order
+    all_records: list[DocumentRecord | None] = [None] * total_docs
+    workers = max(1, min(settings.pipeline_concurrency, total_docs))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(_process_document, job_id, source_file_id, i + 1, *doc_input): i
+            for i, doc_input in enumerate(doc_inputs)
+        }
+        try:
+            for done, future in enumerate(as_completed(futures), start=1):
+                all_records[futures[future]] = future.result()
+                update_job(
+                    job_id,
+                    progress=round(0.20 + done * progress_per_doc, 2),
+                    current_step=f"Processed doc {done}/{total_docs}",
+                )
+        except BaseException:
+            # Don't start documents nobody will collect
+            for future in futures:
+                future.cancel()
+            raise
+
+    return all_records
+
+
+def _process_document(
+    job_id: str,
+    source_file_id: str,
+    doc_number: int,
+    doc_id: str,
+    page_range: PageRange,
+    doc_pages: list[PageText],
+) -> DocumentRecord:
+    """Run Pipeline A and B on one document and reconcile them."""
+    log = logger.bind(job_id=job_id, source_file_id=source_file_id)
+
+    # Pipelines A and B are independent: run B alongside A so the document
+    # waits for the slower of the two LLM calls, not both in turn
+    log.info("pipeline_b_start", doc=doc_number)
+    future_b = _get_pipeline_pool().submit(run_pipeline_b, doc_pages)
+    try:
+        log.info("pipeline_a_start", doc=doc_number, pages=f"{page_range.start_page}-{page_range.end_page}")
+        result_a = run_pipeline_a(doc_pages)
+    except BaseException:
+        future_b.cancel()
+        raise
+    result_b = future_b.result()
+
+    # Reconcile
+    recon = reconcile(result_a, result_b)
+
+    record = DocumentRecord(
+        source_file_id=source_file_id,
+        doc_id=doc_id,
+        page_start=page_range.start_page,
+        page_end=page_range.end_page,
+        # Pipeline A
+        supplier_a=result_a.supplier,
+        po_primary_a=result_a.po_primary,
+        po_secondary_a=result_a.po_secondary,
+        po_numbers_a=result_a.po_numbers,
+        confidence_a=result_a.confidence,
+        method_a=result_a.method.value,
+        # Pipeline B
+        supplier_b=result_b.supplier,
+        po_primary_b=result_b.po_primary,
+        po_secondary_b=result_b.po_secondary,
+        po_numbers_b=result_b.po_numbers,
+        confidence_b=result_b.confidence,
+        method_b=result_b.method.value,
+        # Reconciliation
+        match_status=recon.match_status,
+        decided_po_primary=recon.decided_po_primary,
+        decided_po_secondary=recon.decided_po_secondary,
+        decided_po_numbers=recon.decided_po_numbers,
+        status=recon.status,
+        next_action=recon.next_action,
+        reject_reason=recon.reject_reason,
+    )
+
+    log.info(
+        "doc_processed",
+        doc=doc_number,
+        status=recon.status.value,
+        match=recon.match_status.value,
+        po=recon.decided_po_primary,
+    )
+    return record
+
+
+def regenerate_index_excel(
+    source_file_id: str,
+    doc_index: int | None = None,
+    job_id: str | None = None,
+) -> None:
+    """Refresh index.xlsx (and the reconcile JSON artifact) from reconcile.db.
+
+    With ``doc_index`` only that row is rewritten (falling back to a full
+    rebuild if the workbook or row does not exist). Progress is reported on
+    ``job_id`` when given. Called from an RQ worker or inline.
+    """
+    log = logger.bind(job_id=job_id, source_file_id=source_file_id)
+    if job_id:
+        update_job(job_id, status=JobStatus.RUNNING, current_step="Generating Excel")
 
-    from app.config import settings
-    from app.schemas.common import PipelineMethod
+    try:
+        # One refresh per batch at a time: two row updates loading and saving
+        # index.xlsx concurrently would lose one of the edits. Reading
+        # reconcile.db under the lock also means the last writer has the
+        # latest data.
+        with storage.excel_lock(source_file_id):
+            reconcile_data = storage.load_reconcile(source_file_id)
+            if reconcile_data is None:
+                raise FileNotFoundError(f"Reconcile artifact not found: {source_file_id}")
+            # Edits only touch reconcile.db; refresh the JSON projection off the request path
+            storage.save_artifact(source_file_id, "reconcile", reconcile_data)
+
+            excel_path = None
+            if doc_index is not None:
+                record = _reconcile_entry_to_record(
+                    source_file_id, doc_index, reconcile_data[doc_index]
+                )
+                excel_path = update_index_excel_row(source_file_id, doc_index, record)
+            if excel_path is None:
+                excel_path = generate_index_excel(
+                    source_file_id,
+                    [
+                        _reconcile_entry_to_record(source_file_id, i, d)
+                        for i, d in enumerate(reconcile_data)
+                    ],
+                )
+    except Exception as exc:
+        log.error("excel_regen_failed", error=str(exc))
+        if job_id:
+            update_job(job_id, status=JobStatus.FAILED, current_step="Failed", error=str(exc))
+        raise
 
-    d = Path(settings.storage_base_path) / "rejects"
-    d.mkdir(parents=True, exist_ok=True)
+    if job_id:
+        update_job(
+            job_id,
+            status=JobStatus.COMPLETED,
+            progress=1.0,
+            current_step="Completed",
+            result={"excel_path": str(excel_path)},
+        )
 
-    reject_id = str(uuid_mod.uuid4())
-    now = datetime.now(timezone.utc).isoformat()
 
+def _build_reject_record(record: DocumentRecord, now: str) -> dict:
+    """Build the reject record for a NOT_OK document (``now``: ISO timestamp)."""
     reject = {
-        "reject_id": reject_id,
+        "reject_id": str(uuid.uuid4()),
         "source_file_id": record.source_file_id,
         "doc_id": record.doc_id,
         "page_start": record.page_start,
@@ -257,5 +415,59 @@ def _create_reject_record(record: DocumentRecord) -> None:
         "updated_at": now,
     }
 
-    path = d / f"{reject_id}.json"
-    path.write_text(json.dumps(reject, ensure_ascii=False, indent=2, default=str), encoding="utf-8")
+    return reject
+
+
+def _reconcile_entry(d: dict) -> dict:
+    """Reconcile entry for a dumped DocumentRecord.
+
+    Same shape as POST /v1/reconcile results plus ``doc_id``, so a single-row
+    Excel refresh can rebuild the whole row from it.
+    """
+    pipeline_fields = ("supplier", "po_primary", "po_secondary", "po_numbers", "confidence", "method")
+    return {
+        "doc_id": d["doc_id"],
+        "range": {"start_page": d["page_start"], "end_page": d["page_end"]},
+        "result_a": {f: d[f"{f}_a"] for f in pipeline_fields},
+        "result_b": {f: d[f"{f}_b"] for f in pipeline_fields},
+        "match_status": d["match_status"],
+        "decided_po_primary": d["decided_po_primary"],
+        "decided_po_secondary": d["decided_po_secondary"],
+        "decided_po_numbers": d["decided_po_numbers"],
+        "status": d["status"],
+        "next_action": d["next_action"],
+        "reject_reason": d["reject_reason"],
+    }
+
+
+def _reconcile_entry_to_record(source_file_id: str, index: int, d: dict) -> DocumentRecord:
+    """Build the Excel row record for reconcile artifact entry ``index``."""
+    result_a = d.get("result_a") or {}
+    result_b = d.get("result_b") or {}
+    doc_range = d.get("range") or {}
+
+    return DocumentRecord(
+        source_file_id=source_file_id,
+        doc_id=d.get("doc_id") or f"{source_file_id}_doc{str(index + 1).zfill(3)}",
+        page_start=doc_range.get("start_page", 0),
+        page_end=doc_range.get("end_page", 0),
+        supplier_a=result_a.get("supplier"),
+        po_primary_a=result_a.get("po_primary"),
+        po_secondary_a=result_a.get("po_secondary"),
+        po_numbers_a=result_a.get("po_numbers", []),
+        confidence_a=result_a.get("confidence", 0),
+        method_a=result_a.get("method"),
+        supplier_b=result_b.get("supplier"),
+        po_primary_b=result_b.get("po_primary"),
+        po_secondary_b=result_b.get("po_secondary"),
+        po_numbers_b=result_b.get("po_numbers", []),
+        confidence_b=result_b.get("confidence", 0),
+        method_b=result_b.get("method"),
+        match_status=d.get("match_status"),
+        decided_po_primary=d.get("decided_po_primary"),
+        decided_po_secondary=d.get("decided_po_secondary"),
+        decided_po_numbers=d.get("decided_po_numbers", []),
+        status=d.get("status"),
+        next_action=d.get("next_action"),
+        reject_reason=d.get("reject_reason"),
+    )
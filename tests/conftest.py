@@ -0,0 +1,30 @@
+"""Shared test fixtures."""
+
+import pytest
+
+from app.config import settings
+
+
+class _FakeRedis:
+    """In-process stand-in for the few Redis calls the stores make."""
+
+    def __init__(self):
+        self.data: dict[str, str] = {}
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    def get(self, key):
+        return self.data.get(key)
+
+
+@pytest.fixture(autouse=True)
+def _tmp_storage(tmp_path, monkeypatch):
+    """Point storage at a temp dir; the stores re-index when the path changes."""
+    monkeypatch.setattr(settings, "storage_base_path", str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def fake_redis():
+    return _FakeRedis()
@@ -0,0 +1,45 @@
+"""Tests for the document update endpoint."""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.schemas.common import JobStatus
+from app.storage import job_store
+from app.storage import local as storage
+
+
+class _FakeQueue:
+    """Records enqueue_call() instead of talking to Redis."""
+
+    calls: list[dict] = []
+
+    def __init__(self, connection=None):
+        pass
+
+    def enqueue_call(self, func, args=None, kwargs=None, timeout=None, **options):
+        self.calls.append({"func": func, "kwargs": kwargs, "timeout": timeout, **options})
+
+
+@pytest.fixture
+def fake_queue(monkeypatch, fake_redis):
+    monkeypatch.setattr(job_store, "_redis", lambda: fake_redis)
+    monkeypatch.setattr("rq.Queue", _FakeQueue)
+    _FakeQueue.calls = []
+    return _FakeQueue
+
+
+class TestUpdateDocument:
+    def test_enqueued_task_receives_tracking_job_id(self, fake_queue):
+        storage.save_reconcile("src-1", [{"doc_id": "d0", "decided_po_primary": "50001234"}])
+
+        resp = TestClient(app).patch("/v1/documents/src-1/0", json={"decided_po_primary": "50009999"})
+
+        assert resp.status_code == 200
+        excel_job_id = resp.json()["excel_job_id"]
+        (call,) = fake_queue.calls
+        assert call["func"] == "app.workers.tasks.regenerate_index_excel"
+        # The tracking id must reach the task, not become the RQ job's own id
+        assert call["kwargs"] == {"source_file_id": "src-1", "doc_index": 0, "job_id": excel_job_id}
+        assert "job_id" not in call
+        assert job_store.get_job(excel_job_id)["status"] == JobStatus.PENDING.value
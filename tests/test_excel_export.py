@@ -0,0 +1,101 @@
+"""Tests for the index.xlsx export and in-place row updates."""
+
+import threading
+
+from openpyxl import load_workbook
+
+from app.schemas.common import DocumentRecord, FinalStatus, MatchStatus, NextAction
+from app.services.excel_export import generate_index_excel, update_index_excel_row
+from app.storage import local as storage
+from app.workers.tasks import _reconcile_entry, regenerate_index_excel
+
+
+def _record(index: int, **overrides) -> DocumentRecord:
+    fields = {
+        "source_file_id": "src-1",
+        "doc_id": f"src-1_doc{index:03d}",
+        "page_start": index,
+        "page_end": index,
+        "supplier_a": "ACME",
+        "po_primary_a": "50001234",
+        "po_numbers_a": ["50001234", "50005678"],
+        "decided_po_primary": "50001234",
+        "match_status": MatchStatus.MATCH_OK,
+        "status": FinalStatus.OK,
+    }
+    fields.update(overrides)
+    return DocumentRecord(**fields)
+
+
+def _rows(path) -> list[tuple]:
+    return list(load_workbook(path).active.iter_rows(values_only=True))
+
+
+class TestUpdateIndexExcelRow:
+    def test_row_update_matches_full_rebuild(self):
+        records = [_record(0), _record(1)]
+        path = generate_index_excel("src-1", records)
+
+        # Fields that become None/empty must be cleared, not left stale
+        records[1] = _record(
+            1,
+            supplier_a=None,
+            po_primary_a=None,
+            po_numbers_a=[],
+            decided_po_primary=None,
+            match_status=MatchStatus.NEEDS_REVIEW,
+            status=FinalStatus.NOT_OK,
+        )
+        assert update_index_excel_row("src-1", 1, records[1]) == path
+        patched = _rows(path)
+
+        generate_index_excel("src-1", records)
+        assert patched == _rows(path)
+
+    def test_missing_row_requests_full_rebuild(self):
+        generate_index_excel("src-1", [_record(0)])
+        assert update_index_excel_row("src-1", 5, _record(5)) is None
+
+
+class TestRegenerateIndexExcel:
+    def test_row_refresh_waits_for_excel_lock(self):
+        storage.save_reconcile("src-1", [
+            {"doc_id": "d0", "decided_po_primary": "50001234", "status": "OK"},
+            {"doc_id": "d1", "decided_po_primary": "50005678", "status": "OK"},
+        ])
+        regenerate_index_excel("src-1")
+        storage.update_reconcile_doc("src-1", 1, {"decided_po_primary": "50009999"})
+
+        with storage.excel_lock("src-1"):
+            worker = threading.Thread(target=regenerate_index_excel, args=("src-1", 1))
+            worker.start()
+            worker.join(timeout=0.2)
+            # Blocked: another refresh holds the workbook
+            assert worker.is_alive()
+        worker.join(timeout=5)
+
+        assert not worker.is_alive()
+        assert "50009999" in _rows(storage.get_excel_path("src-1"))[2]
+
+    def test_row_patch_keeps_other_columns(self):
+        # Persist and export the way process_full_flow does
+        records = [
+            _record(i, doc_id=f"doc-uuid-{i}", supplier_b="ACME", po_primary_b="50001234", confidence_a=0.9)
+            for i in range(2)
+        ]
+        storage.save_reconcile("src-1", [_reconcile_entry(r.model_dump(mode="json")) for r in records])
+        before = _rows(generate_index_excel("src-1", records))
+
+        storage.update_reconcile_doc(
+            "src-1", 1, {"decided_po_primary": "50009999", "next_action": NextAction.REVISTO.value}
+        )
+        regenerate_index_excel("src-1", doc_index=1)
+        after = _rows(storage.get_excel_path("src-1"))
+
+        header = before[0]
+        changed = {
+            header[col] for col in range(len(header)) if before[2][col] != after[2][col]
+        }
+        assert changed == {"decided_po_primary", "next_action"}
+        assert after[2][header.index("doc_id")] == "doc-uuid-1"
+        assert after[:2] == before[:2]
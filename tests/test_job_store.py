@@ -0,0 +1,85 @@
+"""Tests for job state persistence and progress-tick coalescing."""
+
+import json
+import time
+import uuid
+
+import pytest
+
+from app.schemas.common import JobStatus
+from app.storage import job_store
+
+
+@pytest.fixture(autouse=True)
+def _patch_redis(fake_redis, monkeypatch):
+    monkeypatch.setattr(job_store, "_redis", lambda: fake_redis)
+    yield
+    # Stop the flusher while the fakes are still patched in, so it never
+    # outlives the test and writes to the real Redis or storage path.
+    job_store._stop_flusher()
+    job_store._memory_store.clear()
+
+
+def _redis_job(client, job_id) -> dict:
+    return json.loads(client.data[f"job:{job_id}"])
+
+
+def _job_file(tmp_path, source_file_id="src-1") -> dict:
+    return json.loads((tmp_path / "outputs" / source_file_id / "job.json").read_text(encoding="utf-8"))
+
+
+class TestJobStore:
+    def test_progress_ticks_are_coalesced(self, _tmp_storage, fake_redis, monkeypatch):
+        # Flush by hand: the background thread exits straight away
+        monkeypatch.setattr(job_store, "_flush_loop", lambda: None)
+        job_id = job_store.create_job("src-1")
+        job_store.update_job(job_id, status=JobStatus.RUNNING)
+
+        for i in range(1, 6):
+            job_store.update_job(job_id, progress=i / 10, current_step=f"step {i}")
+
+        # Readers in this process see the latest tick; nothing is written yet
+        assert job_store.get_job(job_id)["progress"] == 0.5
+        assert _redis_job(fake_redis, job_id)["progress"] == 0.0
+
+        job_store._flush_dirty()
+        assert _redis_job(fake_redis, job_id)["current_step"] == "step 5"
+        # Ticks do not rewrite the job.json mirror
+        assert _job_file(_tmp_storage)["progress"] == 0.0
+
+    def test_status_change_is_written_through(self, _tmp_storage, monkeypatch):
+        monkeypatch.setattr(job_store, "_flush_loop", lambda: None)
+        job_id = job_store.create_job("src-1")
+        job_store.update_job(job_id, progress=0.3)
+        job_store.update_job(job_id, status=JobStatus.COMPLETED, progress=1.0, result={"ok": True})
+
+        saved = _job_file(_tmp_storage)
+        assert saved["status"] == JobStatus.COMPLETED.value
+        assert saved["progress"] == 1.0
+        assert saved["result"] == {"ok": True}
+
+    def test_auxiliary_job_keeps_batch_job_file(self, _tmp_storage, fake_redis):
+        batch_job = job_store.create_job("src-1")
+        aux_job = job_store.create_job("src-1", persist_file=False)
+        job_store.update_job(aux_job, status=JobStatus.COMPLETED, result={"excel_path": "x"})
+
+        assert _job_file(_tmp_storage)["job_id"] == batch_job
+        assert _redis_job(fake_redis, aux_job)["status"] == JobStatus.COMPLETED.value
+
+    def test_background_flush(self, fake_redis, monkeypatch):
+        monkeypatch.setattr(job_store, "_FLUSH_INTERVAL", 0.01)
+        job_id = job_store.create_job("src-1")
+        job_store.update_job(job_id, progress=0.42)
+
+        deadline = time.monotonic() + 2
+        while _redis_job(fake_redis, job_id)["progress"] != 0.42 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert _redis_job(fake_redis, job_id)["progress"] == 0.42
+
+    def test_job_ids_are_time_ordered(self):
+        first = job_store.create_job("src-1")
+        time.sleep(0.002)
+        second = job_store.create_job("src-1")
+
+        assert uuid.UUID(first).version == 7
+        assert first < second
@@ -2,6 +2,7 @@
 
 import pytest
 
+from app.services import po_extraction
 from app.services.po_extraction import (
     find_keywords_in_text,
     extract_po_near_keywords,
@@ -93,6 +94,19 @@ class TestKeywordMatching:
         pos, kws, evidence = extract_po_near_keywords(text, page_num=0)
         assert "50001234" in pos
 
+    def test_keyword_position_in_original_text(self):
+        """Positions point into the original text, not the whitespace-collapsed one."""
+        text = "Data:      2024-01-15\n\n\n      Encomenda    cliente n.º 50001234"
+        found = find_keywords_in_text(text)
+        pos = dict(found)["Encomenda cliente n.º"]
+        assert text[pos:].startswith("Encomenda")
+
+    def test_keyword_after_long_whitespace_run(self):
+        """A PO next to a keyword is found even when blank runs precede the keyword."""
+        text = "Fatura" + "\n" * 300 + "V/PEDIDO: 50001234"
+        pos, kws, evidence = extract_po_near_keywords(text, page_num=0)
+        assert "50001234" in pos
+
     def test_normalize_keyword_consistency(self):
         """Normalized keywords are lowercase, no accents, trimmed."""
         assert _normalize_keyword("Réf. BL interne:") == "ref. bl interne:"
@@ -102,3 +116,12 @@ class TestKeywordMatching:
     def test_all_keywords_present(self):
         """Verify all keywords are in the list."""
         assert len(PO_KEYWORDS) >= 80  # we have ~85 keywords
+
+    @pytest.mark.skipif(po_extraction._KEYWORD_AUTOMATON is None, reason="pyahocorasick not installed")
+    def test_scan_paths_agree_on_overlapping_matches(self):
+        """Both keyword scans skip a match overlapping the same keyword's previous one."""
+        # "numero de orden" overlaps itself on the shared "n"
+        text = _normalize_keyword("Número de ordenúmero de orden: 123 / Pedido Pedido")
+        loop = po_extraction._find_keywords_loop(text)
+        assert po_extraction._find_keywords_automaton(text) == loop
+        assert [pos for kw, pos in loop if kw == "Número de orden"] == [0]
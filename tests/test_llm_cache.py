@@ -0,0 +1,47 @@
+"""Tests for the Redis-backed LLM response cache."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from app.services import openai_client
+from app.storage import llm_cache
+
+
+class _FakeOpenAI:
+    """Counts calls and always answers with the same PO."""
+
+    def __init__(self):
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, **kwargs):
+        self.calls += 1
+        content = '{"po_primary": "50001234", "confidence": 0.9}'
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+@pytest.fixture
+def fake_openai(monkeypatch):
+    client = _FakeOpenAI()
+    monkeypatch.setattr(openai_client, "_get_client", lambda: client)
+    return client
+
+
+class TestLlmCache:
+    def test_identical_request_hits_cache(self, fake_openai, fake_redis, monkeypatch):
+        monkeypatch.setattr(llm_cache, "_redis", lambda: fake_redis)
+        first = openai_client.call_openai_structured("prompt", "document text")
+        second = openai_client.call_openai_structured("prompt", "document text")
+
+        assert first == second == {"po_primary": "50001234", "confidence": 0.9}
+        assert fake_openai.calls == 1
+
+        openai_client.call_openai_structured("prompt", "other document")
+        assert fake_openai.calls == 2
+
+    def test_no_redis_always_calls_api(self, fake_openai, monkeypatch):
+        monkeypatch.setattr(llm_cache, "_redis", lambda: None)
+        openai_client.call_openai_structured("prompt", "document text")
+        openai_client.call_openai_structured("prompt", "document text")
+        assert fake_openai.calls == 2
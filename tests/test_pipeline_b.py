@@ -0,0 +1,78 @@
+"""Tests for Pipeline B's LLM input selection."""
+
+import pytest
+
+from app.schemas.common import PageText, PipelineMethod
+from app.services import pipeline_b
+from app.services.pipeline_b import _build_llm_text, run_pipeline_b
+
+
+def _page(page: int, text: str) -> PageText:
+    return PageText(page=page, text=text)
+
+
+class TestBuildLlmText:
+    def test_short_document_sent_whole(self):
+        pages = [_page(0, "Fatura"), _page(1, "Nº Pedido: 50001234")]
+        assert _build_llm_text(pages, budget=1000) == (
+            "--- PAGE 0 ---\nFatura\n\n--- PAGE 1 ---\nNº Pedido: 50001234"
+        )
+
+    def test_long_document_keeps_keyword_pages(self):
+        filler = "Lorem ipsum dolor sit amet. " * 40  # ~1.1k chars, no keywords
+        pages = [_page(i, filler) for i in range(10)]
+        pages[7] = _page(7, filler + "Nº Pedido: 50001234")
+
+        text = _build_llm_text(pages, budget=3000)
+
+        assert "--- PAGE 7 ---" in text
+        assert "50001234" in text
+        assert "[... pages omitted ...]" in text
+        # Kept pages stay in document order
+        assert text.index("--- PAGE 7 ---") < text.index("--- PAGE 8 ---")
+        assert "--- PAGE 0 ---" not in text
+
+    def test_single_oversized_page_is_cut(self):
+        pages = [_page(0, "x" * 5000)]
+        text = _build_llm_text(pages, budget=1000)
+        assert text.endswith("[... text truncated ...]")
+        assert len(text) < 1100
+
+    def test_oversized_keyword_page_is_cut_not_dropped(self):
+        pages = [_page(0, "Nº Pedido: 50001234 " + "x" * 70000), _page(1, "Thank you")]
+        text = _build_llm_text(pages, budget=60000)
+
+        assert "--- PAGE 0 ---" in text
+        assert "50001234" in text
+        assert "[... text truncated ...]" in text
+        assert len(text) <= 60000
+
+    def test_oversized_page_keeps_late_keyword(self):
+        pages = [_page(0, "x" * 70000 + " Nº Pedido: 50001234 " + "x" * 5000), _page(1, "Fim")]
+        text = _build_llm_text(pages, budget=10000)
+
+        assert "50001234" in text
+        assert text.index("[... text truncated ...]") < text.index("50001234")
+
+
+class TestLlmSkip:
+    @pytest.fixture
+    def llm_calls(self, monkeypatch):
+        calls = []
+
+        def fake_call(**kwargs):
+            calls.append(kwargs)
+            return {"po_primary": None, "confidence": 0.0}
+
+        monkeypatch.setattr(pipeline_b, "call_openai_structured", fake_call)
+        return calls
+
+    def test_nothing_po_like_skips_llm(self, llm_calls):
+        result = run_pipeline_b([_page(0, "Packing list\nQty 12 boxes, total 340 kg")])
+        assert llm_calls == []
+        assert result.po_primary is None
+        assert result.method == PipelineMethod.REGEX
+
+    def test_po_shaped_number_still_calls_llm(self, llm_calls):
+        run_pipeline_b([_page(0, "PO 50001234")])
+        assert len(llm_calls) == 1
@@ -2,7 +2,7 @@
 
 import pytest
 
-from app.reconcile.engine import reconcile, ReconcileResult
+from app.reconcile.engine import reconcile, reconcile_batch, ReconcileResult
 from app.reconcile.po_normalizer import normalize_po, canonicalize_po, are_equivalent
 from app.schemas.common import (
     Evidence,
@@ -39,6 +39,12 @@ class TestPONormalizer:
     def test_normalize_strips_non_digits(self):
         assert normalize_po("PO-5000/1234") == "50001234"
 
+    def test_normalize_already_clean(self):
+        assert normalize_po("50001234") == "50001234"
+
+    def test_normalize_drops_non_ascii_digits(self):
+        assert normalize_po("5000\u00b21234") == "50001234"
+
     def test_normalize_none(self):
         assert normalize_po(None) is None
         assert normalize_po("") is None
@@ -77,6 +83,25 @@ class TestReconcileEngine:
         assert result.next_action == NextAction.AUTO_OK
         assert result.decided_po_primary == "50001234"
 
+    def test_same_primary_different_secondary_is_not_match(self):
+        """Identical primaries alone are not a full match when secondaries differ."""
+        a = _make_result(po_primary="50001234", po_secondary="80005678", confidence=0.9)
+        b = _make_result(po_primary="50001234", po_secondary="80009999", confidence=0.9)
+
+        result = reconcile(a, b)
+        assert result.match_status == MatchStatus.NEEDS_REVIEW
+        assert result.status == FinalStatus.NOT_OK
+
+    def test_match_ok_decided_po_numbers(self):
+        """Identical single POs produce the same outcome as the full comparison."""
+        a = _make_result(po_primary="50001234", confidence=0.9)
+        b = _make_result(po_primary="50001234", confidence=0.3)
+
+        result = reconcile(a, b, min_confidence=0.6)
+        assert result.match_status == MatchStatus.MATCH_OK
+        assert result.decided_po_secondary is None
+        assert result.decided_po_numbers == ["50001234"]
+
     def test_mismatch_different_primaries(self):
         """Both pipelines find different POs."""
         a = _make_result(po_primary="50001111", confidence=0.9)
@@ -134,3 +159,46 @@ class TestReconcileEngine:
         assert result.status == FinalStatus.OK
         assert result.decided_po_primary == "50001234"
         assert result.decided_po_secondary == "80005678"
+
+    def test_partial_match_with_leading_zero_equivalence(self):
+        """Sets overlap on one PO (after leading-zero stripping) but differ on the other."""
+        a = _make_result(po_primary="50001111", po_secondary="80002222", confidence=0.9)
+        b = _make_result(po_primary="050001111", po_secondary="80003333", confidence=0.9)
+
+        result = reconcile(a, b, allow_leading_zero=True)
+        assert result.match_status == MatchStatus.NEEDS_REVIEW
+        assert result.status == FinalStatus.NOT_OK
+        assert "Partial" in result.reject_reason
+
+        result = reconcile(a, b, allow_leading_zero=False)
+        assert result.match_status == MatchStatus.MISMATCH
+
+    def test_result_is_immutable(self):
+        """ReconcileResult is a frozen value object."""
+        result = reconcile(_make_result(po_primary="50001234"), _make_result(po_primary="50001234"))
+        with pytest.raises(AttributeError):
+            result.status = FinalStatus.NOT_OK
+
+    def test_memoized_on_confidence_and_options(self):
+        """Cached outcomes are keyed on confidence and reconcile options too."""
+        a, b = _make_result(po_primary="050001234"), _make_result(po_primary="50001234")
+        assert reconcile(a, b, allow_leading_zero=True) is reconcile(a, b, allow_leading_zero=True)
+        assert reconcile(a, b, allow_leading_zero=False).match_status == MatchStatus.MISMATCH
+
+        low_a = _make_result(po_primary="050001234", confidence=0.1)
+        low_b = _make_result(po_primary="50001234", confidence=0.1)
+        assert reconcile(low_a, low_b, allow_leading_zero=True).status == FinalStatus.NOT_OK
+
+    def test_reconcile_batch_matches_per_pair(self):
+        """reconcile_batch returns the same outcomes as per-pair reconcile, in order."""
+        pairs = [
+            (_make_result(po_primary="50001234"), _make_result(po_primary="50001234")),
+            (_make_result(po_primary="50001111"), _make_result(po_primary="80002222")),
+            (_make_result(confidence=0.0), _make_result(confidence=0.0)),
+        ]
+        batch = reconcile_batch([a for a, _ in pairs], [b for _, b in pairs])
+        assert batch == [reconcile(a, b) for a, b in pairs]
+
+    def test_reconcile_batch_length_mismatch(self):
+        with pytest.raises(ValueError):
+            reconcile_batch([_make_result()], [])
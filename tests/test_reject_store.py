@@ -0,0 +1,58 @@
+"""Tests for the JSONL-backed reject store."""
+
+import json
+
+from app.config import settings
+from app.storage import reject_store
+
+
+def _reject(reject_id: str, source_file_id: str = "src-1", resolved: bool = False) -> dict:
+    return {
+        "reject_id": reject_id,
+        "source_file_id": source_file_id,
+        "doc_id": f"{source_file_id}_doc",
+        "resolved": resolved,
+    }
+
+
+class TestRejectStore:
+    def test_save_and_list(self):
+        reject_store.save_reject(_reject("r1"))
+        reject_store.save_reject(_reject("r2", source_file_id="src-2"))
+
+        assert [r["reject_id"] for r in reject_store.list_rejects()] == ["r1", "r2"]
+        assert [r["reject_id"] for r in reject_store.list_rejects("src-2")] == ["r2"]
+        assert reject_store.list_rejects("unknown") == []
+
+    def test_latest_version_wins(self):
+        reject_store.save_reject(_reject("r1"))
+        reject_store.save_reject(_reject("r1", resolved=True))
+
+        rejects = reject_store.list_rejects()
+        assert len(rejects) == 1
+        assert reject_store.get_reject("r1")["resolved"] is True
+
+    def test_batch_save(self):
+        reject_store.save_rejects([_reject("r1"), _reject("r2")])
+        assert len(reject_store.list_rejects("src-1")) == 2
+
+    def test_picks_up_lines_from_other_writers(self, _tmp_storage):
+        reject_store.save_reject(_reject("r1"))
+        assert reject_store.get_reject("r2") is None
+
+        # Simulate another process (e.g. an RQ worker) appending to the log
+        log = _tmp_storage / "rejects" / reject_store.LOG_NAME
+        with open(log, "a", encoding="utf-8") as f:
+            f.write(json.dumps(_reject("r2")) + "\n")
+
+        assert reject_store.get_reject("r2") is not None
+
+    def test_migrates_legacy_json_files(self, tmp_path, monkeypatch):
+        legacy_base = tmp_path / "legacy"
+        d = legacy_base / "rejects"
+        d.mkdir(parents=True)
+        (d / "old.json").write_text(json.dumps(_reject("old")), encoding="utf-8")
+
+        monkeypatch.setattr(settings, "storage_base_path", str(legacy_base))
+        assert reject_store.get_reject("old") is not None
+        assert not (d / "old.json").exists()